@@ -1,53 +1,80 @@
-# backend/auth_utils.py
+# backend/auths_utils.py
+import asyncio
+from collections import defaultdict
+from cachetools import TTLCache
 from supabase import Client
 from postgrest.exceptions import APIError
 
+# User rows rarely change, so keep them for a few minutes to skip Supabase on the hot auth path
+_user_cache = TTLCache(maxsize=10_000, ttl=300)
+# One lock per user so concurrent cold requests for the same user only hit the DB once
+_user_locks = defaultdict(asyncio.Lock)
+
+
+def invalidate_user_cache(user_id: str) -> None:
+    """Drops the cached row for a user. Call this after updating their profile."""
+    _user_cache.pop(user_id, None)
+
+
 async def ensure_user_exists(db_client: Client, user_id: str, email: str = None) -> dict:
     """
-    Checks if a user exists in the 'users' table using the Clerk ID (user_id) 
-    and inserts them if they don't. Returns the user data.
+    Ensures a row exists in the 'users' table for the Clerk ID (user_id) and
+    returns the user data. Results are cached in-process for a short TTL.
+    """
+    cached_user = _user_cache.get(user_id)
+    if cached_user is not None:
+        return cached_user
+
+    async with _user_locks[user_id]:
+        # Another request may have filled the cache while we were waiting
+        cached_user = _user_cache.get(user_id)
+        if cached_user is None:
+            cached_user = _upsert_user(db_client, user_id, email)
+            _user_cache[user_id] = cached_user
+    _user_locks.pop(user_id, None)
+    return cached_user
+
+
+def _upsert_user(db_client: Client, user_id: str, email: str = None) -> dict:
+    """
+    Uses a single upsert (INSERT ... ON CONFLICT) so new and existing users
+    both cost one round-trip.
     """
     
-    # 1. Check if the user exists
-    user_result = (
-        db_client.table('users')
-        .select('user_id, email, first_name') 
-        .eq('user_id', user_id)
-        .limit(1)
-        .execute()
-    )
-    
-    user_data = user_result.data
+    if not email:
+        # Without an email we cannot create the row, so just look it up
+        user_result = (
+            db_client.table('users')
+            .select('user_id, email, first_name') 
+            .eq('user_id', user_id)
+            .limit(1)
+            .execute()
+        )
+        if user_result.data:
+            return user_result.data[0]
+        raise ValueError("Email is required to create a new user.")
+
+    new_user_data = {
+        'user_id': user_id, # Clerk ID as PK
+        'email': email,
+    }
     
-    if user_data:
-        # User exists
-        return user_data[0]
-    else:
-        # 2. User does not exist, insert new user
-        if not email:
-            raise ValueError("Email is required to create a new user.")
-            
-        new_user_data = {
-            'user_id': user_id, # Clerk ID as PK
-            'email': email,
-        }
+    try:
+        upsert_result = (
+            db_client.table('users')
+            .upsert(new_user_data, on_conflict='user_id', ignore_duplicates=False)
+            .execute()
+        )
         
-        try:
-            insert_result = (
-                db_client.table('users')
-                .insert(new_user_data)
-                .execute()
-            )
-            
-            # The inserted data is returned in insert_result.data
-            if insert_result.data:
-                return insert_result.data[0]
-            else:
-                 # This path is generally for successful but empty responses, which is unlikely
-                raise Exception("Insert operation failed to return data.")
-
-        except APIError as e:
-            # Handle specific Supabase/PostgREST errors 
-            raise Exception(f"Database error during user creation: {e.message}")
-        except Exception as e:
-             raise Exception(f"An unexpected error occurred during user creation: {e}")
\ No newline at end of file
+        # The upserted row is returned in upsert_result.data
+        if upsert_result.data:
+            return upsert_result.data[0]
+        else:
+             # This path is generally for successful but empty responses, which is unlikely
+            raise Exception("Upsert operation failed to return data.")
+
+    except APIError as e:
+        # Handle specific Supabase/PostgREST errors 
+        raise Exception(f"Database error during user creation: {e.message}")
+    except Exception as e:
+         raise Exception(f"An unexpected error occurred during user creation: {e}")
\ No newline at end of file
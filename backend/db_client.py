@@ -1,53 +1,40 @@
 # backend/db_client.py
 
 import os
+from functools import lru_cache
 from dotenv import load_dotenv
-from supabase import create_client, Client
+import httpx
+from supabase import create_client, Client, ClientOptions
 from pathlib import Path 
 
 # 1. EXPLICITLY CALCULATE PATH TO .env FILE
 DOTENV_PATH = Path(__file__).parent / ".env"
-load_dotenv(dotenv_path=DOTENV_PATH) 
+
+@lru_cache(maxsize=None)
+def _load_env() -> tuple:
+    """Loads backend/.env exactly once and returns the Supabase settings."""
+    load_dotenv(dotenv_path=DOTENV_PATH)
+    return os.getenv("SUPABASE_URL"), os.getenv("SUPABASE_SERVICE_KEY")
 
 # --- Configuration ---
-SUPABASE_URL = os.getenv("SUPABASE_URL")
-SUPABASE_KEY = os.getenv("SUPABASE_SERVICE_KEY")
+SUPABASE_URL, SUPABASE_KEY = _load_env()
+
+SUPABASE_TIMEOUT = float(os.getenv("SUPABASE_TIMEOUT", "10"))
+SUPABASE_CONNECT_TIMEOUT = float(os.getenv("SUPABASE_CONNECT_TIMEOUT", "2"))
 
 if not SUPABASE_URL or not SUPABASE_KEY:
     
     raise EnvironmentError("SUPABASE_URL and SUPABASE_SERVICE_KEY must be set in environment variables.")
 
 # --- Supabase Client Initialization ---
+@lru_cache(maxsize=1)
 def get_supabase_client() -> Client:
-    """Initializes and returns the Supabase client."""
-    # Using the 'supabase-py' library
-    return create_client(SUPABASE_URL, SUPABASE_KEY)
-
-# backend/auths_utils.py
-from supabase import Client
-
-async def ensure_user_exists(db_client: Client, clerk_user_id: str, email: str):
-    try:
-        # Check if user exists using Supabase syntax
-        result = db_client.table('users').select('*').eq('user_id', clerk_user_id).execute()
-        
-        if result.data and len(result.data) > 0:
-            # User exists, return it
-            return result.data[0]
-        
-        # User doesn't exist, create new user
-        new_user_data = {
-            'user_id': clerk_user_id,
-            'email': email
-        }
-        
-        insert_result = db_client.table('users').insert(new_user_data).execute()
-        
-        if insert_result.data and len(insert_result.data) > 0:
-            return insert_result.data[0]
-        else:
-            raise Exception("Failed to create user in database")
-            
-    except Exception as e:
-        print(f"Error in ensure_user_exists: {e}")
-        raise Exception(f"Database error while ensuring user exists: {e}")
\ No newline at end of file
+    """Returns the process-wide Supabase client, creating it on first use."""
+    # Using the 'supabase-py' library. Building a client per request re-creates
+    # its HTTP sessions and auth state, so every caller shares this one instance.
+    # PostgREST calls go over the client's pooled HTTP/2 session, so TLS is paid
+    # once per process; fail fast on connect instead of waiting on the default timeout.
+    options = ClientOptions(
+        postgrest_client_timeout=httpx.Timeout(SUPABASE_TIMEOUT, connect=SUPABASE_CONNECT_TIMEOUT)
+    )
+    return create_client(SUPABASE_URL, SUPABASE_KEY, options=options)
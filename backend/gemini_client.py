@@ -1,9 +1,52 @@
 import os
-import json
+import re
+import logging
+import asyncio
+import hashlib
+from functools import lru_cache
+from typing import Any, Awaitable, Callable
+from cachetools import TTLCache
 from pydantic import BaseModel
 import google.generativeai as genai
 from google.api_core import exceptions
 
+logger = logging.getLogger(__name__)
+
+
+# Read once at import instead of on every Gemini client build
+GEMINI_API_KEY = os.getenv("GEMINI_API_KEY", "")
+
+# Upper bound on simultaneous ATS calls to Gemini; reports now run as background tasks,
+# so a burst of uploads would otherwise fire them all at once
+MAX_CONCURRENT_ATS_CALLS = 8
+
+# ~8k tokens of resume is plenty for an ATS match; prefill time grows with input length
+ATS_RESUME_MAX_CHARS = 32000
+
+# Warm-up is only an optimization, so a slow or unreachable Gemini gives up on it quickly
+WARM_UP_REQUEST_OPTIONS = {"timeout": 5}
+
+# A response wrapped in a ```json block (closing fence optional, any case); group 1 is the payload.
+# Gemini sometimes adds one despite being asked for bare JSON
+_CODE_FENCE_RE = re.compile(r"^\s*```(?:json)?\s*(.*?)\s*(?:```\s*)?$", re.DOTALL | re.IGNORECASE)
+
+def strip_code_fences(text: str) -> str:
+    """Return the JSON inside a markdown code block, or the stripped text if it isn't fenced"""
+    match = _CODE_FENCE_RE.match(text)
+    return match.group(1) if match else text.strip()
+
+async def run_coalesced(inflight: dict[str, asyncio.Future], key: str,
+                        make_call: Callable[[], Awaitable[Any]]) -> Any:
+    """Awaits make_call(), unless a call for the same key is already in flight, in which
+    case its result is shared. Shielded so one caller disconnecting doesn't cancel the
+    call for the others."""
+    task = inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(make_call())
+        inflight[key] = task
+        task.add_done_callback(lambda _: inflight.pop(key, None))
+    return await asyncio.shield(task)
+
 
 class ATSReportSchema(BaseModel):
     """Defines the structure of the desired ATS Report JSON output."""
@@ -11,27 +54,41 @@ class ATSReportSchema(BaseModel):
     missing_keywords: list[str]
     suggestions: list[str]
 
-def get_ats_report(resume_text: str, job_description: str) -> dict:
-    """
-    Analyzes the resume against the job description using the Gemini API 
-    and returns a structured ATS report.
-    """
+@lru_cache(maxsize=1)
+def configure_gemini() -> None:
+    """Configures the Gemini SDK once per process. genai.configure() discards the SDK's
+    cached clients and their open connections, so every module configures through here."""
+    genai.configure(api_key=GEMINI_API_KEY)
+
+@lru_cache(maxsize=1)
+def get_gemini_model() -> genai.GenerativeModel:
+    """Configures the Gemini SDK once and returns the shared model instance.
+    Also used for the interview reports and the API status check."""
+    configure_gemini()
+    return genai.GenerativeModel('gemini-2.0-flash-exp')
+
+def warm_up_gemini_channel() -> None:
+    """Opens the SDK's shared sync gRPC channel at startup, so the first question or
+    report request doesn't pay for the TCP/TLS handshake. Failures are non-fatal."""
+    if not GEMINI_API_KEY:
+        return
     try:
-        genai.configure(api_key=os.environ.get("GEMINI_API_KEY"))
-        model = genai.GenerativeModel('gemini-2.0-flash-exp')
-    except Exception as e:
-        print(f"Error initializing Gemini client: {e}")
-        # Return a fallback/empty report on failure
-        return {
-            "match_score": 0,
-            "missing_keywords": ["AI Service Unavailable"],
-            "suggestions": ["Please check the backend logs for AI connection errors."]
-        }
-        
-    prompt = f"""
+        # count_tokens is free and goes over the same channel generate_content uses
+        get_gemini_model().count_tokens("warm-up", request_options=WARM_UP_REQUEST_OPTIONS)
+    except Exception:
+        logger.warning("Gemini warm-up failed; the channel will be opened on first use", exc_info=True)
+
+# Built once at import; the resume and job description are the only per-call parts,
+# so they come after the instructions to keep a stable prompt prefix
+_ATS_PROMPT_TEMPLATE = """
     You are an expert ATS (Applicant Tracking System) and Career Coach. 
     Analyze the provided RESUME against the JOB DESCRIPTION.
 
+    Provide a concise ATS report using the requested JSON schema. 
+    1. 'match_score' is an integer (0-100) representing the match percentage.
+    2. 'missing_keywords' is a list of up to 5 critical keywords/skills from the job description missing or underrepresented in the resume.
+    3. 'suggestions' is a list of up to 5 actionable suggestions to improve the resume for this specific job, focusing on gaps and quantification.
+
     RESUME:
     ---
     {resume_text}
@@ -41,32 +98,90 @@ def get_ats_report(resume_text: str, job_description: str) -> dict:
     ---
     {job_description}
     ---
+    """
 
-    Provide a concise ATS report using the requested JSON schema. 
-    1. 'match_score' is an integer (0-100) representing the match percentage.
-    2. 'missing_keywords' is a list of up to 5 critical keywords/skills from the job description missing or underrepresented in the resume.
-    3. 'suggestions' is a list of up to 5 actionable suggestions to improve the resume for this specific job, focusing on gaps and quantification.
+# Passing the Pydantic class makes the SDK rebuild its schema on every call, so resolve it once
+_ATS_RESPONSE_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "match_score": {"type": "INTEGER"},
+        "missing_keywords": {"type": "ARRAY", "items": {"type": "STRING"}},
+        "suggestions": {"type": "ARRAY", "items": {"type": "STRING"}},
+    },
+    "required": ["match_score", "missing_keywords", "suggestions"],
+}
+
+_ATS_GENERATION_CONFIG = {"response_mime_type": "application/json", "response_schema": _ATS_RESPONSE_SCHEMA}
+
+# Finished reports keyed by content hash, plus in-flight calls so concurrent duplicates share one
+_ats_cache = TTLCache(maxsize=1024, ttl=3600)
+_ats_inflight: dict[str, asyncio.Future] = {}
+_ats_semaphore = asyncio.Semaphore(MAX_CONCURRENT_ATS_CALLS)
+
+def _ats_cache_key(resume_text: str, job_description: str) -> str:
+    return hashlib.blake2b(
+        f"{resume_text}\x00{job_description}".encode(), digest_size=16
+    ).hexdigest()
+
+async def get_ats_report(resume_text: str, job_description: str) -> dict:
     """
+    Analyzes the resume against the job description using the Gemini API 
+    and returns a structured ATS report. Identical requests within an hour,
+    or already in flight, reuse the same result instead of calling Gemini again.
+    """
+    # PDF extraction pads text with runs of whitespace that only cost input tokens;
+    # normalizing first also lets differently-extracted copies share a cache entry
+    resume_text = " ".join(resume_text.split())[:ATS_RESUME_MAX_CHARS]
+    key = _ats_cache_key(resume_text, job_description)
+    cached_report = _ats_cache.get(key)
+    if cached_report is not None:
+        return cached_report
+
+    return await run_coalesced(
+        _ats_inflight, key, lambda: _generate_ats_report(resume_text, job_description, key)
+    )
 
+async def _generate_ats_report(resume_text: str, job_description: str, cache_key: str) -> dict:
+    """Runs the Gemini ATS analysis, caching only successful reports."""
     try:
-        response = model.generate_content(
-            contents=prompt,
-            generation_config={"response_mime_type": "application/json", "response_schema": ATSReportSchema}
-        )
+        model = get_gemini_model()
+    except Exception:
+        logger.exception("Error initializing Gemini client")
+        # Return a fallback/empty report on failure
+        return {
+            "match_score": 0,
+            "missing_keywords": ["AI Service Unavailable"],
+            "suggestions": ["Please check the backend logs for AI connection errors."]
+        }
         
-        # The response.text will be a valid JSON string matching ATSReportSchema
+    prompt = _ATS_PROMPT_TEMPLATE.format(
+        resume_text=resume_text,
+        job_description=job_description
+    )
 
-        return json.loads(response.text)
+    try:
+        # Async call so the event loop keeps serving other requests during the LLM round-trip
+        async with _ats_semaphore:
+            response = await model.generate_content_async(
+                contents=prompt,
+                generation_config=_ATS_GENERATION_CONFIG
+            )
+        
+        # The response.text will be a valid JSON string matching ATSReportSchema;
+        # pydantic-core parses and validates it in one pass
+        report = ATSReportSchema.model_validate_json(response.text).model_dump()
+        _ats_cache[cache_key] = report
+        return report
 
     except exceptions.GoogleAPICallError as e:
-        print(f"Gemini API Error: {e}")
+        logger.exception("Gemini API error during ATS analysis")
         return {
             "match_score": 0,
             "missing_keywords": ["AI Processing Failed"],
             "suggestions": [f"AI Model failed to generate report. Detail: {e}"]
         }
-    except exceptions.GoogleAPICallError as e:
-        print(f"An unexpected error occurred during AI analysis: {e}")
+    except Exception:
+        logger.exception("An unexpected error occurred during ATS analysis")
         return {
             "match_score": 0,
             "missing_keywords": ["Internal Analysis Error"],
@@ -1,16 +1,206 @@
 # backend/hr_interview_service.py
 
-import json
-from typing import Dict, List, Any, Optional
+import orjson
+import os
+import logging
+import re
+from typing import Dict, List, Any, Optional, Set, Tuple
 from sqlalchemy.orm import Session
-from datetime import datetime
+from datetime import datetime, timezone
 import uuid
+import asyncio
+import hashlib
+import threading
+from functools import lru_cache
+from cachetools import LRUCache, TTLCache
+from rapidfuzz import fuzz, process
 
 # Import models directly to avoid circular imports
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, JSON, DateTime, ARRAY
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, JSON, DateTime, ARRAY, Index, func, insert, select, text, update
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred, joinedload, raiseload
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.dialects.postgresql import JSONB
 from hr_questions import HRQuestionGenerator
+from gemini_client import get_gemini_model, strip_code_fences
+
+logger = logging.getLogger(__name__)
+
+GEMINI_API_KEY = os.getenv("GEMINI_API_KEY", "")
+
+FALLBACK_EVALUATION = {
+    "relevance_score": 50,
+    "communication_score": 50,
+    "key_strengths": ["Attempted to answer"],
+    "improvement_areas": ["Need more structure in answers"],
+    "overall_feedback": "Basic answer provided. Try to structure your answers better."
+}
+
+# Fallback report feedback, rotated across questions for variety
+_FEEDBACK_TEMPLATES = (
+    {
+        "what_went_well": "You showed confidence in sharing your experience and maintained good communication throughout your response.",
+        "areas_to_improve": "Try to include more specific metrics or outcomes. For example, instead of saying 'improved the process,' mention 'reduced processing time by 30%.'",
+        "better_approach": "Structure your answer with a clear beginning (context), middle (your actions), and end (measurable results). Quantify your impact wherever possible."
+    },
+    {
+        "what_went_well": "Your answer demonstrated self-awareness and willingness to learn from experiences.",
+        "areas_to_improve": "Add more concrete examples to illustrate your points. Real scenarios make your answer more memorable and credible.",
+        "better_approach": "Share a specific incident: What was happening? What did you do? What was the outcome? This narrative structure makes answers more engaging."
+    },
+    {
+        "what_went_well": "You addressed the question directly and showed understanding of what was being asked.",
+        "areas_to_improve": "Expand on the 'why' behind your actions. Explain your thought process and what led you to make certain decisions.",
+        "better_approach": "Walk the interviewer through your decision-making: What options did you consider? Why did you choose this path? What did you learn?"
+    },
+    {
+        "what_went_well": "You provided relevant information and stayed on topic throughout your response.",
+        "areas_to_improve": "Connect your experience more explicitly to the role you're applying for. Show how this demonstrates skills they need.",
+        "better_approach": "End with a bridge: 'This experience taught me X, which I believe would help me Y in this role.' Make the relevance crystal clear."
+    },
+    {
+        "what_went_well": "You communicated clearly and your answer had a logical flow.",
+        "areas_to_improve": "Include more details about challenges you faced and how you overcame them. Overcoming obstacles shows problem-solving ability.",
+        "better_approach": "Highlight the difficulty: 'The challenging part was X. I tackled it by Y, which resulted in Z.' This shows resilience and capability."
+    },
+    {
+        "what_went_well": "You demonstrated enthusiasm and genuine interest in discussing your experiences.",
+        "areas_to_improve": "Focus on your individual contributions rather than team achievements. Use 'I' more than 'we' to clarify your specific role.",
+        "better_approach": "Clarify your role: 'While working with the team, my specific responsibility was X. I contributed by doing Y, which led to Z.'"
+    },
+    {
+        "what_went_well": "Your response showed honesty and authenticity, which are valued in interviews.",
+        "areas_to_improve": "Provide more context about the situation. Help the interviewer understand the stakes and complexity of what you were dealing with.",
+        "better_approach": "Set the scene better: 'This was during [timeframe], when [context]. The challenge was significant because [why it mattered].'"
+    },
+    {
+        "what_went_well": "You maintained a professional tone and organized your thoughts well before speaking.",
+        "areas_to_improve": "Add emotional intelligence elements: How did you handle stress? How did you manage relationships? Show your soft skills.",
+        "better_approach": "Include the human element: 'I stayed calm by X. I collaborated with others by Y. This helped build trust and achieve results.'"
+    }
+)
+
+# Expected-answer guidance for the fallback report, checked in order; first matching keyword wins
+_EXPECTED_ANSWERS = (
+    (re.compile("strength|weakness|about yourself|describe"),
+     "An ideal answer should highlight 2-3 genuine strengths/weaknesses with specific examples. Be honest but strategic - show self-awareness and how you're working on improvements. Include real stories that demonstrate these qualities in action."),
+    (re.compile("conflict|disagree|difficult"),
+     "A strong answer explains the situation objectively, describes how you stayed professional, shows empathy for other perspectives, explains your resolution approach, and highlights the positive outcome or lessons learned. Focus on problem-solving, not blame."),
+    (re.compile("failure|mistake|wrong"),
+     "An excellent answer owns the mistake honestly, explains what went wrong without excuses, describes what you learned, and shows how you've applied that lesson since. Demonstrate growth mindset and accountability."),
+    (re.compile("why|company|role|position"),
+     "A compelling answer shows you've researched the company, connects your skills/experience to specific role requirements, mentions company values or culture that resonate with you, and explains how this aligns with your career goals. Show genuine enthusiasm."),
+    (re.compile("team|collaborate|work with"),
+     "An ideal answer demonstrates your teamwork philosophy, gives a specific example of successful collaboration, shows how you handle different working styles, and highlights both your contributions and how you helped others succeed."),
+    (re.compile("pressure|stress|deadline|tight"),
+     "A strong answer explains your stress management strategies, provides a specific high-pressure scenario, describes how you prioritized and stayed organized, shows how you maintained quality under pressure, and includes the successful outcome."),
+    (re.compile("goal|future|five years|career"),
+     "An excellent answer shows clear career direction, demonstrates ambition balanced with realism, connects your goals to growth opportunities at this company, and shows you've thought seriously about your professional development."),
+)
+_DEFAULT_EXPECTED_ANSWER = "An ideal answer should be specific and concrete, include relevant examples from your experience, demonstrate the skills or qualities being assessed, show reflection and learning, and connect clearly to the question being asked."
+
+# Questions come from a small fixed pool, so most lookups are repeats across sessions
+@lru_cache(maxsize=1024)
+def _expected_answer_for(question: str) -> str:
+    """Pick the expected-answer guidance for a question by its keywords."""
+    question_lower = question.lower()
+    return next(
+        (text for pattern, text in _EXPECTED_ANSWERS if pattern.search(question_lower)),
+        _DEFAULT_EXPECTED_ANSWER
+    )
+
+# token_sort_ratio at or above this counts as the same question; unlike token_set_ratio
+# it does not treat a question as a match for any longer question that contains it
+QUESTION_SIMILARITY_THRESHOLD = 90
+
+_NON_ALNUM_RE = re.compile(r"[^a-z0-9]+")
+
+def _normalize_question(question: str) -> str:
+    """Lowercase and collapse punctuation/whitespace so trivial edits compare equal."""
+    return _NON_ALNUM_RE.sub(" ", question.lower()).strip()
+
+def _was_asked(question: str, asked: Set[str]) -> bool:
+    """True if a normalized question matches, or nearly matches, one already asked."""
+    if question in asked:
+        return True
+    return process.extractOne(
+        question, asked, scorer=fuzz.token_sort_ratio, score_cutoff=QUESTION_SIMILARITY_THRESHOLD
+    ) is not None
+
+# Built once at import; only the transcript changes per report, so it goes last and
+# everything before it is an identical prefix across requests
+_REPORT_PROMPT_TEMPLATE = """
+You are an expert HR interviewer and career coach. Analyze the HR interview session transcript at the end of this prompt and provide a comprehensive performance report with question-by-question feedback.
+
+**Task:**
+Analyze the candidate's responses to the HR/behavioral questions in the transcript and provide a detailed performance report in JSON format:
+
+{{
+    "overall_score": <integer 0-100 based on answer quality>,
+    "category_scores": [
+        {{"category": "Communication Skills", "score": <0-100>}},
+        {{"category": "Self-Awareness", "score": <0-100>}},
+        {{"category": "Problem-Solving Approach", "score": <0-100>}},
+        {{"category": "Cultural Fit", "score": <0-100>}},
+        {{"category": "Career Motivation", "score": <0-100>}}
+    ],
+    "strengths": [
+        "<specific strength with concrete example from their answers>",
+        "<specific strength with concrete example from their answers>",
+        "<specific strength with concrete example from their answers>"
+    ],
+    "weaknesses": [
+        "<specific weakness with constructive advice and example>",
+        "<specific weakness with constructive advice and example>",
+        "<specific weakness with constructive advice and example>"
+    ],
+    "personalized_feedback": "<4-5 sentences of highly personalized, constructive feedback that references specific answers they gave and provides actionable insights>",
+    "recommendations": [
+        "<actionable recommendation with specific steps>",
+        "<actionable recommendation with specific steps>"
+    ],
+    "question_by_question_feedback": [
+        {{
+            "question_number": 1,
+            "question": "<the actual question asked>",
+            "user_answer": "<their complete answer as they provided it>",
+            "expected_answer": "<1-2 paragraphs explaining what an ideal answer would include - key points, structure, and examples that would make it a strong response>",
+            "score": <0-100>,
+            "what_went_well": "<specific positive aspects of their answer>",
+            "areas_to_improve": "<specific suggestions for improvement, OR if score is 85+, write: 'Excellent answer! No major improvements needed - you covered all the key points effectively.'>",
+            "better_answer_approach": "<how they could structure a better answer using STAR method, OR if score is 85+, write: 'Your answer was well-structured. Keep using this approach!'>"
+        }},
+        ... (one entry for each Q&A pair)
+    ]
+}}
+
+**Evaluation Criteria:**
+1. **Communication Skills**: Clarity, structure (STAR method), articulation
+2. **Self-Awareness**: Understanding of strengths/weaknesses, growth mindset
+3. **Problem-Solving Approach**: How they handle challenges and conflicts
+4. **Cultural Fit**: Team collaboration, values alignment
+5. **Career Motivation**: Goals, passion, commitment
+
+**IMPORTANT:** 
+- Be VERY specific and reference actual content from their answers
+- For each question, provide detailed, constructive feedback
+- Avoid generic feedback - make it truly personalized
+- Provide concrete examples of what they did well and what to improve
+- Give them actionable insights they can use immediately
+- **SCORING**: Be realistic and nuanced:
+  - 90-100: Exceptional answer with STAR structure, specific examples, and measurable results
+  - 80-89: Very good answer with clear structure and relevant examples
+  - 70-79: Good answer but lacking some specificity or structure
+  - 60-69: Adequate answer but needs more development
+  - Below 60: Weak answer that misses key points
+- **For scores 85+**: In areas_to_improve, write: "Excellent answer! No major improvements needed - you covered all the key points effectively." And in better_answer_approach: "Your answer was well-structured. Keep using this approach!"
+- **For scores below 85**: Provide specific, actionable improvement suggestions
+
+Return ONLY the JSON, no markdown formatting.
+
+**Interview Transcript:**
+{transcript}
+"""
 
 Base = declarative_base()
 
@@ -21,7 +211,7 @@ class User(Base):
     email = Column(Text, unique=True, nullable=False)
     first_name = Column(Text, nullable=True)
     last_name = Column(Text, nullable=True)
-    created_at = Column(DateTime, default=datetime.now)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
     
     resumes = relationship("Resume", back_populates="user")
     sessions = relationship("InterviewSession", back_populates="user")
@@ -30,31 +220,49 @@ class Resume(Base):
     __tablename__ = "resumes"
     resume_id = Column(Text, primary_key=True, default=lambda: str(uuid.uuid4()))
     user_id = Column(Text, ForeignKey("users.user_id"), nullable=False)
-    upload_date = Column(DateTime, default=datetime.now)
+    upload_date = Column(DateTime(timezone=True), server_default=func.now())
     job_role = Column(Text, nullable=True)
-    raw_text = Column(Text, nullable=False)
+    # Deferred: question generation selects it explicitly
+    raw_text = deferred(Column(Text, nullable=False))
     job_description = Column(Text, nullable=True)
-    structured_data = Column(JSON, nullable=True)
-    initial_questions = Column(JSON, nullable=True)
-    ats_report = Column(JSON, nullable=True)
+    structured_data = Column(JSONB, nullable=True)
+    initial_questions = Column(JSONB, nullable=True)
+    ats_report = Column(JSONB, nullable=True)
     embedding = Column(JSON, nullable=True)
 
     user = relationship("User", back_populates="resumes")
 
+    # Postgres doesn't index foreign keys automatically; index names match schema.sql
+    __table_args__ = (
+        # Also serves "latest resume for a user": one index probe, read backwards for DESC
+        Index("idx_resumes_user_id_upload_date", "user_id", "upload_date"),
+    )
+
 class InterviewSession(Base):
     __tablename__ = "interview_sessions"
     session_id = Column(Text, primary_key=True, default=lambda: str(uuid.uuid4()))
     user_id = Column(Text, ForeignKey("users.user_id"), nullable=False)
-    start_time = Column(DateTime, default=datetime.now)
-    end_time = Column(DateTime, nullable=True)
+    start_time = Column(DateTime(timezone=True), server_default=func.now())
+    end_time = Column(DateTime(timezone=True), nullable=True)
     difficulty = Column(String, nullable=True)
     topics_covered = Column(ARRAY(Text), nullable=True)  
     final_score = Column(Integer, nullable=True)
-    final_report = Column(Text, nullable=True)
+    final_report = Column(JSONB, nullable=True)
     status = Column(String, default="active")
 
     user = relationship("User", back_populates="sessions")
-    messages = relationship("InterviewMessage", back_populates="session")
+    messages = relationship("InterviewMessage", back_populates="session", order_by="InterviewMessage.timestamp")
+
+    __table_args__ = (
+        # Plain per-user lookups, and a user's sessions newest first; a backward scan serves the DESC order
+        Index("idx_sessions_user_id_start_time", "user_id", "start_time"),
+        # History and stats only read completed sessions; covering their columns allows index-only scans
+        Index(
+            "idx_sessions_user_id_completed_start_time", "user_id", "start_time",
+            postgresql_where=text("status = 'completed'"),
+            postgresql_include=["session_id", "end_time", "difficulty", "topics_covered", "final_score"],
+        ),
+    )
 
 class InterviewMessage(Base):
     __tablename__ = "interview_messages"
@@ -62,7 +270,7 @@ class InterviewMessage(Base):
     session_id = Column(Text, ForeignKey("interview_sessions.session_id"), nullable=False)
     role = Column(String, nullable=False)
     content = Column(Text, nullable=False)
-    timestamp = Column(DateTime, default=datetime.now)
+    timestamp = Column(DateTime(timezone=True), server_default=func.now())
     confidence_score = Column(Integer, nullable=True)
     facial_emotion = Column(String, nullable=True)
     proctoring_flag = Column(String, nullable=True)
@@ -70,457 +278,478 @@ class InterviewMessage(Base):
 
     session = relationship("InterviewSession", back_populates="messages")
 
+    __table_args__ = (
+        # Covers session lookups and returns each session's messages already in timestamp order
+        Index("idx_messages_session_id_timestamp", "session_id", "timestamp"),
+    )
+
 class HRInterviewService:
     def __init__(self):
         
         self.question_generator = HRQuestionGenerator()
+        # Generated HR question sets keyed by (resume_id, job_role, text hash), so repeat calls skip the LLM
+        self._hr_questions_cache = LRUCache(maxsize=512)
+        # Gemini report JSON keyed by transcript hash, so retries don't pay for a second analysis.
+        # Reports are generated on the threadpool, so access goes through the lock
+        self._report_cache = TTLCache(maxsize=256, ttl=3600)
+        self._report_cache_lock = threading.Lock()
+
+    @staticmethod
+    def _hr_questions_key(resume) -> tuple:
+        """Cache key for a resume's question set; changes if the resume text or role is edited"""
+        text_hash = hashlib.blake2b(resume.raw_text.encode("utf-8"), digest_size=16).hexdigest()
+        return (resume.resume_id, resume.job_role or "", text_hash)
+
+    @staticmethod
+    def _load_resume_for_questions(db: Session, session_id: str, resume_id: str):
+        """Check the session and read the resume columns question picking uses, in one round-trip.
+        The read transaction is ended before returning, so no pooled connection is held
+        while the caller awaits Gemini."""
+        try:
+            resume = db.execute(
+                select(Resume.resume_id, Resume.raw_text, Resume.job_role, Resume.initial_questions)
+                .where(
+                    Resume.resume_id == resume_id,
+                    select(InterviewSession.session_id).where(InterviewSession.session_id == session_id).exists()
+                )
+            ).first()
+            db.commit()
+        except SQLAlchemyError:
+            if db.in_transaction():
+                db.rollback()
+            raise
+
+        if not resume:
+            raise ValueError("Session or resume not found")
+        return resume
+
+    async def _get_resume_hr_questions(self, resume) -> Tuple[Dict[str, Any], bool]:
+        """Get the HR question set for a resume row, generating it only once.
+        Returns the set and whether it is newly generated and should be saved on the resume."""
+        cache_key = self._hr_questions_key(resume)
+        cached = self._hr_questions_cache.get(cache_key)
+        if cached is not None:
+            return cached, False
+
+        # Questions persisted on the resume row survive restarts and other workers
+        stored = resume.initial_questions
+        if isinstance(stored, dict) and stored.get("hr_questions"):
+            self._hr_questions_cache[cache_key] = stored
+            return stored, False
+
+        # Use the HR question generator
+        hr_questions_data = await self.question_generator.get_hr_questions_based_on_resume(
+            resume.raw_text, 
+            resume.job_role or ""
+        )
+
+        # Don't persist the fallback set, so a later call can retry the LLM
+        if self.question_generator.is_fallback_hr_questions(hr_questions_data):
+            return hr_questions_data, False
+        self._hr_questions_cache[cache_key] = hr_questions_data
+        return hr_questions_data, True
+
+    @staticmethod
+    def _save_resume_hr_questions(db: Session, resume_id: str, hr_questions_data: Dict[str, Any]) -> None:
+        """Store a generated question set on the resume, committed with the inserts that follow"""
+        db.execute(
+            update(Resume)
+            .where(Resume.resume_id == resume_id)
+            .values(initial_questions=hr_questions_data)
+        )
 
     def create_hr_interview_session(self, db: Session, user_id: str, resume_id: str, job_description: str = "") -> Dict[str, Any]:
         """Create a new HR interview session"""
         try:
-            # Get resume data
-            resume = db.query(Resume).filter(Resume.resume_id == resume_id).first()
-            if not resume:
+            # Only existence matters here, so don't pull the resume row
+            resume_exists = db.query(
+                db.query(Resume).filter(Resume.resume_id == resume_id).exists()
+            ).scalar()
+            if not resume_exists:
                 raise ValueError("Resume not found")
 
             # Create HR interview session
+            session_id = str(uuid.uuid4())
             hr_session = InterviewSession(
-                session_id=str(uuid.uuid4()),
+                session_id=session_id,
                 user_id=user_id,
                 difficulty="medium",
                 topics_covered=["HR", "Behavioral", "Career Goals", "Company Culture"],
-                status="active",
-                start_time=datetime.now()
+                status="active"
             )
             
             db.add(hr_session)
             db.commit()
-            db.refresh(hr_session)
 
             return {
                 "status": "success",
-                "session_id": hr_session.session_id,
+                "session_id": session_id,
                 "session_type": "hr_interview",
                 "resume_id": resume_id,
                 "message": "HR interview session created successfully"
             }
 
-        except Exception as e:
-            db.rollback()
-            raise Exception(f"Failed to create HR interview session: {str(e)}")
+        except SQLAlchemyError:
+            # ValueErrors (missing rows) propagate untouched; only DB failures need a rollback
+            if db.in_transaction():
+                db.rollback()
+            raise
 
-    def generate_next_hr_question(self, db: Session, session_id: str, resume_id: str, 
-                                previous_questions: List[str] = None) -> Dict[str, Any]:
-        """Generate the next HR question for the interview"""
+    def _save_next_question(self, db: Session, resume_id: str, messages: List[Dict[str, Any]],
+                            new_hr_questions: Optional[Dict[str, Any]]) -> None:
+        """Insert message rows, with a newly generated question set, in one commit"""
         try:
-            if previous_questions is None:
-                previous_questions = []
-
-            # Get session and resume
-            session = db.query(InterviewSession).filter(InterviewSession.session_id == session_id).first()
-            resume = db.query(Resume).filter(Resume.resume_id == resume_id).first()
-            
-            if not session or not resume:
-                raise ValueError("Session or resume not found")
-
-            # Use the HR question generator
-            hr_questions_data = self.question_generator.get_hr_questions_based_on_resume(
-                resume.raw_text, 
-                resume.job_role or ""
-            )
-
-            # Filter out previously asked questions
-            available_questions = [
-                q for q in hr_questions_data["hr_questions"] 
-                if q["question"] not in previous_questions
-            ]
-
-            # If no unique questions left, use common questions
-            if not available_questions:
-                available_questions = self.question_generator.get_common_hr_questions()
-
-            # Select next question
-            question_index = len(previous_questions) % len(available_questions)
-            next_question = available_questions[question_index]
-
-            # Save question to database
-            ai_message = InterviewMessage(
-                session_id=session_id,
-                role="ai",
-                content=next_question["question"],
-                timestamp=datetime.now()
-            )
-            db.add(ai_message)
+            if new_hr_questions is not None:
+                self._save_resume_hr_questions(db, resume_id, new_hr_questions)
+            # One executemany INSERT for all the rows
+            db.execute(insert(InterviewMessage), messages)
             db.commit()
-            db.refresh(ai_message)
+        except SQLAlchemyError:
+            if db.in_transaction():
+                db.rollback()
+            raise
 
-            return {
-                "status": "success",
-                "question": next_question,
-                "message_id": ai_message.message_id,
-                "session_type": "hr_interview",
-                "total_questions_asked": len(previous_questions) + 1
+    async def generate_next_hr_question(self, db: Session, session_id: str, resume_id: str, 
+                                      previous_questions: List[str] = None) -> Dict[str, Any]:
+        """Generate the next HR question for the interview"""
+        if previous_questions is None:
+            previous_questions = []
+
+        # The blocking DB steps run in worker threads so a slow pool checkout doesn't stall the event loop
+        resume = await asyncio.to_thread(self._load_resume_for_questions, db, session_id, resume_id)
+        hr_questions_data, is_new = await self._get_resume_hr_questions(resume)
+        next_question = self._pick_next_question(hr_questions_data, previous_questions)
+
+        # Save question to database, with a newly generated question set
+        message_ids, question_rows = self._ai_question_rows(session_id, [next_question])
+        await asyncio.to_thread(
+            self._save_next_question, db, resume_id, question_rows,
+            hr_questions_data if is_new else None
+        )
+
+        return {
+            "status": "success",
+            "question": next_question,
+            "message_id": message_ids[0],
+            "session_type": "hr_interview",
+            "total_questions_asked": len(previous_questions) + 1
+        }
+
+    def _pick_next_question(self, hr_questions_data: Dict[str, Any], previous_questions: List[str]) -> Dict[str, Any]:
+        """Pick the next question that hasn't been asked yet"""
+        # Filter out previously asked questions, including reworded near-duplicates
+        asked = {_normalize_question(q) for q in previous_questions}
+        available_questions = [
+            q for q in hr_questions_data["hr_questions"] 
+            if not _was_asked(_normalize_question(q["question"]), asked)
+        ]
+
+        # If no unique questions left, use common questions
+        if not available_questions:
+            available_questions = self.question_generator.get_common_hr_questions()
+
+        # Select next question
+        question_index = len(previous_questions) % len(available_questions)
+        return available_questions[question_index]
+
+    @staticmethod
+    def _ai_question_rows(session_id: str, questions: List[Dict[str, Any]]) -> Tuple[List[str], List[Dict[str, Any]]]:
+        """Build AI question message rows for a bulk insert, with their IDs"""
+        # IDs are generated client-side so no refresh() is needed to read them back
+        message_ids = [str(uuid.uuid4()) for _ in questions]
+        rows = [
+            {
+                "message_id": message_id,
+                "session_id": session_id,
+                "role": "ai",
+                "content": question["question"],
+                "timestamp": datetime.now(timezone.utc)
             }
-
-        except Exception as e:
-            db.rollback()
-            raise Exception(f"Failed to generate HR question: {str(e)}")
+            for message_id, question in zip(message_ids, questions)
+        ]
+        return message_ids, rows
 
     def evaluate_hr_answer(self, db: Session, session_id: str, question: str, 
                           answer: str, message_id: str) -> Dict[str, Any]:
         """Evaluate HR question answer"""
         try:
             # Save user's answer to database FIRST
+            user_message_id = str(uuid.uuid4())
             user_message = InterviewMessage(
+                message_id=user_message_id,
                 session_id=session_id,
                 role="user",
                 content=answer,
-                timestamp=datetime.now()
+                timestamp=datetime.now(timezone.utc)
             )
             db.add(user_message)
             db.commit()
-            db.refresh(user_message)
-            
-            # Basic evaluation
-            evaluation = {
-                "relevance_score": 75,
-                "communication_score": 70,
-                "key_strengths": ["Answer provided", "Relevant to question"],
-                "improvement_areas": ["Could be more detailed", "Add specific examples"],
-                "overall_feedback": "Good attempt. Try to provide more specific examples using the STAR method (Situation, Task, Action, Result)."
-            }
 
-            return {
-                "status": "success", 
-                "evaluation": evaluation,
-                "user_message_id": user_message.message_id,
-                "message": "Answer evaluated successfully"
-            }
+        except SQLAlchemyError:
+            # A lost answer must fail the request, not come back as a scored success
+            if db.in_transaction():
+                db.rollback()
+            raise
 
-        except Exception as e:
-            db.rollback()
-            # Fallback evaluation
+        try:
+            evaluation = self._score_answer(question, answer)
+        except Exception:
+            # Fallback evaluation; the answer is already saved
             return {
                 "status": "success",
-                "evaluation": {
-                    "relevance_score": 50,
-                    "communication_score": 50,
-                    "key_strengths": ["Attempted to answer"],
-                    "improvement_areas": ["Need more structure in answers"],
-                    "overall_feedback": "Basic answer provided. Try to structure your answers better."
-                },
+                "evaluation": dict(FALLBACK_EVALUATION),
+                "user_message_id": user_message_id,
                 "message": "Basic evaluation completed"
             }
 
-    def generate_hr_interview_report(self, db: Session, session_id: str) -> Dict[str, Any]:
-        """Generate comprehensive HR interview report with AI analysis"""
-        try:
-            import os
-            import google.generativeai as genai
-            
-            session = db.query(InterviewSession).filter(InterviewSession.session_id == session_id).first()
-            if not session:
-                raise ValueError("Session not found")
+        return {
+            "status": "success", 
+            "evaluation": evaluation,
+            "user_message_id": user_message_id,
+            "message": "Answer evaluated successfully"
+        }
+
+    async def evaluate_hr_answer_and_next(self, db: Session, session_id: str, resume_id: str, question: str,
+                                          answer: str,
+                                          previous_questions: List[str] = None) -> Dict[str, Any]:
+        """Save the answer and the next HR question in one transaction, then evaluate the answer"""
+        if previous_questions is None:
+            previous_questions = []
+
+        resume = await asyncio.to_thread(self._load_resume_for_questions, db, session_id, resume_id)
+        hr_questions_data, is_new = await self._get_resume_hr_questions(resume)
+        next_question = self._pick_next_question(hr_questions_data, previous_questions)
+
+        user_message_id = str(uuid.uuid4())
+        answer_row = {
+            "message_id": user_message_id,
+            "session_id": session_id,
+            "role": "user",
+            "content": answer,
+            "timestamp": datetime.now(timezone.utc)
+        }
+        # Built after the answer so its timestamp sorts after it in the transcript
+        next_message_ids, question_rows = self._ai_question_rows(session_id, [next_question])
+        # The answer and the next question go in with one executemany INSERT
+        await asyncio.to_thread(
+            self._save_next_question, db, resume_id, [answer_row, *question_rows],
+            hr_questions_data if is_new else None
+        )
 
-            # Get all messages (questions and answers)
-            messages = db.query(InterviewMessage).filter(
-                InterviewMessage.session_id == session_id
-            ).order_by(InterviewMessage.timestamp).all()
-            
-            questions_asked = [m for m in messages if m.role == "ai"]
-            answers_given = [m for m in messages if m.role == "user"]
+        try:
+            evaluation = self._score_answer(question, answer)
+        except Exception:
+            evaluation = dict(FALLBACK_EVALUATION)
+
+        return {
+            "status": "success",
+            "evaluation": evaluation,
+            "user_message_id": user_message_id,
+            "question": next_question,
+            "message_id": next_message_ids[0],
+            "session_type": "hr_interview",
+            "total_questions_asked": len(previous_questions) + 1
+        }
+
+    def _score_answer(self, question: str, answer: str) -> Dict[str, Any]:
+        """Score a single answer"""
+        # Basic evaluation
+        return {
+            "relevance_score": 75,
+            "communication_score": 70,
+            "key_strengths": ["Answer provided", "Relevant to question"],
+            "improvement_areas": ["Could be more detailed", "Add specific examples"],
+            "overall_feedback": "Good attempt. Try to provide more specific examples using the STAR method (Situation, Task, Action, Result)."
+        }
+
+    def _generate_ai_report_data(self, conversation_text: str) -> Dict[str, Any]:
+        """Ask Gemini for the HR report JSON for a transcript"""
+        model = get_gemini_model()
+
+        prompt = _REPORT_PROMPT_TEMPLATE.format(transcript=conversation_text)
+        
+        # Stream so the report is received while Gemini is still generating it
+        response = model.generate_content(prompt, stream=True)
+        response_text = "".join(chunk.text for chunk in response)
+        
+        # Clean response
+        response_text = strip_code_fences(response_text)
+        
+        return orjson.loads(response_text)
+
+    def _build_fallback_report(self, session_id: str, qa_pairs: List[Dict[str, str]],
+                               answer_count: int) -> Dict[str, Any]:
+        """Basic report without AI, used when Gemini is unavailable or fails"""
+        logger.debug("Generating basic fallback report")
+        basic_score = min(85, 60 + (answer_count * 5))
+
+        # Generate basic question-by-question feedback with VARIETY
+        question_feedback = []
+
+        for idx, qa_pair in enumerate(qa_pairs):
+            # Rotate through different feedback templates for variety
+            template = _FEEDBACK_TEMPLATES[idx % len(_FEEDBACK_TEMPLATES)]
+
+            # Generate question-specific expected answer based on question content
+            expected = _expected_answer_for(qa_pair["question"])
+
+            question_feedback.append({
+                "question_number": idx + 1,
+                "question": qa_pair["question"],
+                "user_answer": qa_pair["answer"],
+                "expected_answer": expected,
+                "score": basic_score - (idx % 3) * 5,  # Vary scores slightly
+                "what_went_well": template["what_went_well"],
+                "areas_to_improve": template["areas_to_improve"],
+                "better_answer_approach": template["better_approach"]
+            })
+
+        report = {
+            "session_id": session_id,
+            "session_type": "hr_interview",
+            "questions_asked": len(qa_pairs),  # Only count completed Q&A pairs
+            "answers_given": len(qa_pairs),     # Same as questions
+            "overall_score": basic_score,
+            "category_scores": [
+                {"category": "Communication Skills", "score": basic_score - 5},
+                {"category": "Self-Awareness", "score": basic_score},
+                {"category": "Problem-Solving Approach", "score": basic_score - 10},
+                {"category": "Cultural Fit", "score": basic_score + 5},
+                {"category": "Career Motivation", "score": basic_score}
+            ],
+            "strengths": [
+                "You completed the entire interview session, demonstrating commitment and perseverance throughout the process.",
+                "Your responses showed genuine engagement with the questions and an honest attempt to provide thoughtful answers.",
+                "You demonstrated willingness to discuss both achievements and areas for growth, showing self-awareness."
+            ],
+            "weaknesses": [
+                "Your answers could benefit from more structure using the STAR method (Situation, Task, Action, Result) to make them clearer and more impactful.",
+                "Consider providing more specific examples with concrete details, metrics, and measurable outcomes rather than general statements.",
+                "Work on connecting your experiences more explicitly to the skills and qualities the interviewer is looking for in each question."
+            ],
+            "personalized_feedback": f"You successfully completed {len(qa_pairs)} questions in this HR interview. Your responses show that you're making an effort to communicate your experiences, which is a great foundation. To take your interview performance to the next level, focus on structuring your answers using the STAR method - this will help you provide more compelling and memorable responses. Additionally, prepare 3-5 detailed stories from your experience that you can adapt to different behavioral questions. Remember, interviewers want to hear specific examples that demonstrate your skills, not just descriptions of what you can do.",
+            "recommendations": [
+                "Practice answering common HR questions using the STAR method: Start by writing out 5 key achievement stories with specific Situations, Tasks, Actions, and measurable Results. Rehearse these until they feel natural.",
+                "Before your next interview, research the company's values and prepare examples that align with them. Use the 'CAR' technique: Challenge you faced, Actions you took, and Results you achieved.",
+                "Record yourself answering mock interview questions and watch the playback. Look for filler words, unclear structure, and missed opportunities to highlight your impact with specific metrics."
+            ],
+            "question_by_question_feedback": question_feedback,
+            "completion_rate": 100,  # Since we only count answered questions
+            "status": "completed"
+        }
+        return report
 
-            if len(answers_given) == 0:
+    def generate_hr_interview_report(self, db: Session, session_id: str) -> Dict[str, Any]:
+        """Generate comprehensive HR interview report with AI analysis"""
+        # Short read transaction; it ends before Gemini is called so no pooled
+        # connection is held while the report is generated
+        with db.begin():
+            # Reports are often requested before any answer; check that cheaply before loading the transcript
+            has_answer = db.query(
+                db.query(InterviewMessage).filter(
+                    InterviewMessage.session_id == session_id,
+                    InterviewMessage.role == "user"
+                ).exists()
+            ).scalar()
+            if not has_answer:
+                if db.get(InterviewSession, session_id) is None:
+                    raise ValueError("Session not found")
                 raise ValueError("No answers found. Please answer at least one question before generating report.")
 
-            # Build conversation transcript for AI analysis
-            conversation_text = ""
-            qa_pairs = []
-            
-            for i, question_msg in enumerate(questions_asked):
-                # Find corresponding answer
-                answer_msg = next((a for a in answers_given if a.timestamp > question_msg.timestamp), None)
-                if answer_msg:
-                    qa_pairs.append({
-                        "question": question_msg.content,
-                        "answer": answer_msg.content
-                    })
-                    conversation_text += f"\n\nQ{i+1}: {question_msg.content}\nA{i+1}: {answer_msg.content}"
-
-            # Use Gemini AI to generate comprehensive report
-            GEMINI_API_KEY = os.getenv("GEMINI_API_KEY", "")
-            
-            if GEMINI_API_KEY:
-                print(f"\n🔑 Gemini API Key Status: {'✓ Found' if GEMINI_API_KEY else '✗ Missing'}")
-                print(f"📝 Generating AI-powered report for {len(qa_pairs)} questions...")
-                
-                try:
-                    genai.configure(api_key=GEMINI_API_KEY)
-                    model = genai.GenerativeModel('gemini-2.0-flash-exp')
-                    
-                    prompt = f"""
-You are an expert HR interviewer and career coach. Analyze this HR interview session and provide a comprehensive performance report with question-by-question feedback.
-
-**Interview Transcript:**
-{conversation_text}
-
-**Task:**
-Analyze the candidate's responses to these HR/behavioral questions and provide a detailed performance report in JSON format:
-
-{{
-    "overall_score": <integer 0-100 based on answer quality>,
-    "category_scores": [
-        {{"category": "Communication Skills", "score": <0-100>}},
-        {{"category": "Self-Awareness", "score": <0-100>}},
-        {{"category": "Problem-Solving Approach", "score": <0-100>}},
-        {{"category": "Cultural Fit", "score": <0-100>}},
-        {{"category": "Career Motivation", "score": <0-100>}}
-    ],
-    "strengths": [
-        "<specific strength with concrete example from their answers>",
-        "<specific strength with concrete example from their answers>",
-        "<specific strength with concrete example from their answers>"
-    ],
-    "weaknesses": [
-        "<specific weakness with constructive advice and example>",
-        "<specific weakness with constructive advice and example>",
-        "<specific weakness with constructive advice and example>"
-    ],
-    "personalized_feedback": "<4-5 sentences of highly personalized, constructive feedback that references specific answers they gave and provides actionable insights>",
-    "recommendations": [
-        "<actionable recommendation with specific steps>",
-        "<actionable recommendation with specific steps>"
-    ],
-    "question_by_question_feedback": [
-        {{
-            "question_number": 1,
-            "question": "<the actual question asked>",
-            "user_answer": "<their complete answer as they provided it>",
-            "expected_answer": "<1-2 paragraphs explaining what an ideal answer would include - key points, structure, and examples that would make it a strong response>",
-            "score": <0-100>,
-            "what_went_well": "<specific positive aspects of their answer>",
-            "areas_to_improve": "<specific suggestions for improvement, OR if score is 85+, write: 'Excellent answer! No major improvements needed - you covered all the key points effectively.'>",
-            "better_answer_approach": "<how they could structure a better answer using STAR method, OR if score is 85+, write: 'Your answer was well-structured. Keep using this approach!'>"
-        }},
-        ... (one entry for each Q&A pair)
-    ]
-}}
-
-**Evaluation Criteria:**
-1. **Communication Skills**: Clarity, structure (STAR method), articulation
-2. **Self-Awareness**: Understanding of strengths/weaknesses, growth mindset
-3. **Problem-Solving Approach**: How they handle challenges and conflicts
-4. **Cultural Fit**: Team collaboration, values alignment
-5. **Career Motivation**: Goals, passion, commitment
-
-**IMPORTANT:** 
-- Be VERY specific and reference actual content from their answers
-- For each question, provide detailed, constructive feedback
-- Avoid generic feedback - make it truly personalized
-- Provide concrete examples of what they did well and what to improve
-- Give them actionable insights they can use immediately
-- **SCORING**: Be realistic and nuanced:
-  - 90-100: Exceptional answer with STAR structure, specific examples, and measurable results
-  - 80-89: Very good answer with clear structure and relevant examples
-  - 70-79: Good answer but lacking some specificity or structure
-  - 60-69: Adequate answer but needs more development
-  - Below 60: Weak answer that misses key points
-- **For scores 85+**: In areas_to_improve, write: "Excellent answer! No major improvements needed - you covered all the key points effectively." And in better_answer_approach: "Your answer was well-structured. Keep using this approach!"
-- **For scores below 85**: Provide specific, actionable improvement suggestions
+            # Load the session and its transcript columns in one round-trip; raiseload
+            # turns any other lazy load on these objects into an error instead of a query
+            session = db.get(InterviewSession, session_id, options=[
+                joinedload(InterviewSession.messages).load_only(
+                    InterviewMessage.role,
+                    InterviewMessage.content,
+                    InterviewMessage.timestamp
+                ),
+                raiseload("*")
+            ])
+            if not session:
+                raise ValueError("Session not found")
 
-Return ONLY the JSON, no markdown formatting.
-"""
-                    
-                    response = model.generate_content(prompt)
-                    response_text = response.text.strip()
-                    
-                    # Clean response
-                    if response_text.startswith('```json'):
-                        response_text = response_text[7:]
-                    if response_text.startswith('```'):
-                        response_text = response_text[3:]
-                    if response_text.endswith('```'):
-                        response_text = response_text[:-3]
-                    response_text = response_text.strip()
-                    
-                    report_data = json.loads(response_text)
-                    
-                    # Update session with AI-generated report
-                    session.status = "completed"
-                    session.end_time = datetime.now()
-                    session.final_score = report_data.get('overall_score', 0)
-                    session.final_report = json.dumps(report_data)
-                    db.commit()
-                    
-                    return {
-                        "status": "success",
-                        "report": {
-                            "session_id": session_id,
-                            "session_type": "hr_interview",
-                            "questions_asked": len(qa_pairs),  # Only count answered questions
-                            "answers_given": len(qa_pairs),     # Same as questions for completed Q&A
-                            "overall_score": report_data.get('overall_score', 0),
-                            "category_scores": report_data.get('category_scores', []),
-                            "strengths": report_data.get('strengths', []),
-                            "weaknesses": report_data.get('weaknesses', []),
-                            "personalized_feedback": report_data.get('personalized_feedback', ''),
-                            "recommendations": report_data.get('recommendations', []),
-                            "question_by_question_feedback": report_data.get('question_by_question_feedback', []),
-                            "completion_rate": 100,
-                            "status": "completed"
-                        }
-                    }
-                    
-                except Exception as ai_error:
-                    print(f"\n{'='*60}")
-                    print(f"⚠️  AI REPORT GENERATION FAILED - USING FALLBACK")
-                    print(f"{'='*60}")
-                    print(f"Error Type: {type(ai_error).__name__}")
-                    print(f"Error Message: {str(ai_error)}")
-                    print(f"\nPossible Causes:")
-                    print(f"  1. Gemini API key quota exceeded")
-                    print(f"  2. API key missing or invalid")
-                    print(f"  3. Network/connection issue")
-                    print(f"  4. AI model unavailable")
-                    print(f"{'='*60}\n")
-                    # Fall through to basic report
-            else:
-                print(f"\n⚠️  Gemini API Key not found - using fallback report")
-            
-            # Fallback: Basic report without AI
-            print(f"📊 Generating basic fallback report...")
-            basic_score = min(85, 60 + (len(answers_given) * 5))
-            
-            # Generate basic question-by-question feedback with VARIETY
-            question_feedback = []
-            
-            # Define diverse feedback templates based on question patterns
-            feedback_templates = [
-                {
-                    "what_went_well": "You showed confidence in sharing your experience and maintained good communication throughout your response.",
-                    "areas_to_improve": "Try to include more specific metrics or outcomes. For example, instead of saying 'improved the process,' mention 'reduced processing time by 30%.'",
-                    "better_approach": "Structure your answer with a clear beginning (context), middle (your actions), and end (measurable results). Quantify your impact wherever possible."
-                },
-                {
-                    "what_went_well": "Your answer demonstrated self-awareness and willingness to learn from experiences.",
-                    "areas_to_improve": "Add more concrete examples to illustrate your points. Real scenarios make your answer more memorable and credible.",
-                    "better_approach": "Share a specific incident: What was happening? What did you do? What was the outcome? This narrative structure makes answers more engaging."
-                },
-                {
-                    "what_went_well": "You addressed the question directly and showed understanding of what was being asked.",
-                    "areas_to_improve": "Expand on the 'why' behind your actions. Explain your thought process and what led you to make certain decisions.",
-                    "better_approach": "Walk the interviewer through your decision-making: What options did you consider? Why did you choose this path? What did you learn?"
-                },
-                {
-                    "what_went_well": "You provided relevant information and stayed on topic throughout your response.",
-                    "areas_to_improve": "Connect your experience more explicitly to the role you're applying for. Show how this demonstrates skills they need.",
-                    "better_approach": "End with a bridge: 'This experience taught me X, which I believe would help me Y in this role.' Make the relevance crystal clear."
-                },
-                {
-                    "what_went_well": "You communicated clearly and your answer had a logical flow.",
-                    "areas_to_improve": "Include more details about challenges you faced and how you overcame them. Overcoming obstacles shows problem-solving ability.",
-                    "better_approach": "Highlight the difficulty: 'The challenging part was X. I tackled it by Y, which resulted in Z.' This shows resilience and capability."
-                },
-                {
-                    "what_went_well": "You demonstrated enthusiasm and genuine interest in discussing your experiences.",
-                    "areas_to_improve": "Focus on your individual contributions rather than team achievements. Use 'I' more than 'we' to clarify your specific role.",
-                    "better_approach": "Clarify your role: 'While working with the team, my specific responsibility was X. I contributed by doing Y, which led to Z.'"
-                },
-                {
-                    "what_went_well": "Your response showed honesty and authenticity, which are valued in interviews.",
-                    "areas_to_improve": "Provide more context about the situation. Help the interviewer understand the stakes and complexity of what you were dealing with.",
-                    "better_approach": "Set the scene better: 'This was during [timeframe], when [context]. The challenge was significant because [why it mattered].'"
-                },
-                {
-                    "what_went_well": "You maintained a professional tone and organized your thoughts well before speaking.",
-                    "areas_to_improve": "Add emotional intelligence elements: How did you handle stress? How did you manage relationships? Show your soft skills.",
-                    "better_approach": "Include the human element: 'I stayed calm by X. I collaborated with others by Y. This helped build trust and achieve results.'"
-                }
-            ]
-            
-            for idx, qa_pair in enumerate(qa_pairs):
-                # Rotate through different feedback templates for variety
-                template = feedback_templates[idx % len(feedback_templates)]
-                
-                # Generate question-specific expected answer based on question content
-                question_lower = qa_pair["question"].lower()
-                
-                if any(word in question_lower for word in ["strength", "weakness", "about yourself", "describe"]):
-                    expected = "An ideal answer should highlight 2-3 genuine strengths/weaknesses with specific examples. Be honest but strategic - show self-awareness and how you're working on improvements. Include real stories that demonstrate these qualities in action."
-                elif any(word in question_lower for word in ["conflict", "disagree", "difficult"]):
-                    expected = "A strong answer explains the situation objectively, describes how you stayed professional, shows empathy for other perspectives, explains your resolution approach, and highlights the positive outcome or lessons learned. Focus on problem-solving, not blame."
-                elif any(word in question_lower for word in ["failure", "mistake", "wrong"]):
-                    expected = "An excellent answer owns the mistake honestly, explains what went wrong without excuses, describes what you learned, and shows how you've applied that lesson since. Demonstrate growth mindset and accountability."
-                elif any(word in question_lower for word in ["why", "company", "role", "position"]):
-                    expected = "A compelling answer shows you've researched the company, connects your skills/experience to specific role requirements, mentions company values or culture that resonate with you, and explains how this aligns with your career goals. Show genuine enthusiasm."
-                elif any(word in question_lower for word in ["team", "collaborate", "work with"]):
-                    expected = "An ideal answer demonstrates your teamwork philosophy, gives a specific example of successful collaboration, shows how you handle different working styles, and highlights both your contributions and how you helped others succeed."
-                elif any(word in question_lower for word in ["pressure", "stress", "deadline", "tight"]):
-                    expected = "A strong answer explains your stress management strategies, provides a specific high-pressure scenario, describes how you prioritized and stayed organized, shows how you maintained quality under pressure, and includes the successful outcome."
-                elif any(word in question_lower for word in ["goal", "future", "five years", "career"]):
-                    expected = "An excellent answer shows clear career direction, demonstrates ambition balanced with realism, connects your goals to growth opportunities at this company, and shows you've thought seriously about your professional development."
-                else:
-                    expected = "An ideal answer should be specific and concrete, include relevant examples from your experience, demonstrate the skills or qualities being assessed, show reflection and learning, and connect clearly to the question being asked."
-                
-                question_feedback.append({
-                    "question_number": idx + 1,
-                    "question": qa_pair["question"],
-                    "user_answer": qa_pair["answer"],
-                    "expected_answer": expected,
-                    "score": basic_score - (idx % 3) * 5,  # Vary scores slightly
-                    "what_went_well": template["what_went_well"],
-                    "areas_to_improve": template["areas_to_improve"],
-                    "better_answer_approach": template["better_approach"]
+            messages = sorted(session.messages, key=lambda m: m.timestamp)
+
+        questions_asked = [m for m in messages if m.role == "ai"]
+        answers_given = [m for m in messages if m.role == "user"]
+        answer_count = len(answers_given)
+
+        # Build conversation transcript for AI analysis
+        transcript_parts = []
+        qa_pairs = []
+
+        # Both lists are in timestamp order, so the first answer after each question
+        # can be found with a single forward-moving pointer
+        answer_index = 0
+        for i, question_msg in enumerate(questions_asked):
+            # Find corresponding answer
+            while answer_index < answer_count and answers_given[answer_index].timestamp <= question_msg.timestamp:
+                answer_index += 1
+            if answer_index < answer_count:
+                answer_msg = answers_given[answer_index]
+                qa_pairs.append({
+                    "question": question_msg.content,
+                    "answer": answer_msg.content
                 })
-            
-            report = {
-                "session_id": session_id,
-                "session_type": "hr_interview",
-                "questions_asked": len(qa_pairs),  # Only count completed Q&A pairs
-                "answers_given": len(qa_pairs),     # Same as questions
-                "overall_score": basic_score,
-                "category_scores": [
-                    {"category": "Communication Skills", "score": basic_score - 5},
-                    {"category": "Self-Awareness", "score": basic_score},
-                    {"category": "Problem-Solving Approach", "score": basic_score - 10},
-                    {"category": "Cultural Fit", "score": basic_score + 5},
-                    {"category": "Career Motivation", "score": basic_score}
-                ],
-                "strengths": [
-                    "You completed the entire interview session, demonstrating commitment and perseverance throughout the process.",
-                    "Your responses showed genuine engagement with the questions and an honest attempt to provide thoughtful answers.",
-                    "You demonstrated willingness to discuss both achievements and areas for growth, showing self-awareness."
-                ],
-                "weaknesses": [
-                    "Your answers could benefit from more structure using the STAR method (Situation, Task, Action, Result) to make them clearer and more impactful.",
-                    "Consider providing more specific examples with concrete details, metrics, and measurable outcomes rather than general statements.",
-                    "Work on connecting your experiences more explicitly to the skills and qualities the interviewer is looking for in each question."
-                ],
-                "personalized_feedback": f"You successfully completed {len(qa_pairs)} questions in this HR interview. Your responses show that you're making an effort to communicate your experiences, which is a great foundation. To take your interview performance to the next level, focus on structuring your answers using the STAR method - this will help you provide more compelling and memorable responses. Additionally, prepare 3-5 detailed stories from your experience that you can adapt to different behavioral questions. Remember, interviewers want to hear specific examples that demonstrate your skills, not just descriptions of what you can do.",
-                "recommendations": [
-                    "Practice answering common HR questions using the STAR method: Start by writing out 5 key achievement stories with specific Situations, Tasks, Actions, and measurable Results. Rehearse these until they feel natural.",
-                    "Before your next interview, research the company's values and prepare examples that align with them. Use the 'CAR' technique: Challenge you faced, Actions you took, and Results you achieved.",
-                    "Record yourself answering mock interview questions and watch the playback. Look for filler words, unclear structure, and missed opportunities to highlight your impact with specific metrics."
-                ],
-                "question_by_question_feedback": question_feedback,
-                "completion_rate": 100,  # Since we only count answered questions
-                "status": "completed"
-            }
+                transcript_parts.append(f"\n\nQ{i+1}: {question_msg.content}\nA{i+1}: {answer_msg.content}")
+        # Joined once; += in the loop re-copies the whole transcript on every turn
+        conversation_text = "".join(transcript_parts)
+
+        report = None
+
+        # Use Gemini AI to generate comprehensive report
+        if GEMINI_API_KEY:
+            logger.debug("Generating AI-powered report for %d questions", len(qa_pairs))
+
+            try:
+                # Identical transcripts (e.g. a retried request) reuse the earlier analysis
+                report_key = hashlib.blake2b(conversation_text.encode("utf-8"), digest_size=16).hexdigest()
+                with self._report_cache_lock:
+                    report_data = self._report_cache.get(report_key)
+                if report_data is None:
+                    report_data = self._generate_ai_report_data(conversation_text)
+                    with self._report_cache_lock:
+                        self._report_cache[report_key] = report_data
+
+                final_score = report_data.get('overall_score', 0)
+                final_report = report_data
+                report = {
+                    "session_id": session_id,
+                    "session_type": "hr_interview",
+                    "questions_asked": len(qa_pairs),  # Only count answered questions
+                    "answers_given": len(qa_pairs),     # Same as questions for completed Q&A
+                    "overall_score": final_score,
+                    "category_scores": report_data.get('category_scores', []),
+                    "strengths": report_data.get('strengths', []),
+                    "weaknesses": report_data.get('weaknesses', []),
+                    "personalized_feedback": report_data.get('personalized_feedback', ''),
+                    "recommendations": report_data.get('recommendations', []),
+                    "question_by_question_feedback": report_data.get('question_by_question_feedback', []),
+                    "completion_rate": 100,
+                    "status": "completed"
+                }
 
-            # Update session
-            session.status = "completed"
-            session.end_time = datetime.now()
-            session.final_score = basic_score
-            session.final_report = json.dumps(report)
-            db.commit()
+            except Exception:
+                # Usually quota, an invalid key, the network or the model being unavailable
+                logger.exception("AI report generation failed, using the fallback report")
+                # Fall through to basic report
+        else:
+            logger.warning("Gemini API key not found, using the fallback report")
 
-            return {
-                "status": "success",
-                "report": report
-            }
+        if report is None:
+            report = self._build_fallback_report(session_id, qa_pairs, answer_count)
+            final_score = report["overall_score"]
+            final_report = report
 
-        except ValueError as ve:
-            raise Exception(str(ve))
-        except Exception as e:
-            db.rollback()
-            raise Exception(f"Failed to generate HR interview report: {str(e)}")
\ No newline at end of file
+        # Second short transaction just for the session update
+        with db.begin():
+            session.status = "completed"
+            session.end_time = datetime.now(timezone.utc)
+            session.final_score = final_score
+            session.final_report = final_report
+
+        return {
+            "status": "success",
+            "report": report
+        }
@@ -1,273 +1,496 @@
 # backend/hr_questions.py
 
-import json
-from typing import List, Dict, Any
+import orjson
+import re
+import logging
+import asyncio
+import hashlib
+from typing import List, Dict, Any, Optional
+from functools import lru_cache
+from cachetools import LRUCache
+from diskcache import Cache
+from pydantic import BaseModel
 import google.generativeai as genai
+from gemini_client import configure_gemini, run_coalesced, WARM_UP_REQUEST_OPTIONS
 import os
 
+logger = logging.getLogger(__name__)
+
+# Upper bound on simultaneous question-generation calls to Gemini
+MAX_CONCURRENT_GEMINI_CALLS = 8
+
+# Generated question sets live on disk so they survive restarts and are shared by all workers.
+# They're built from resume content, so they go in an app-owned directory, not the shared temp dir
+HR_QUESTIONS_CACHE_DIR = os.getenv(
+    "HR_QUESTIONS_CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "hr_questions")
+)
+HR_QUESTIONS_CACHE_SIZE_LIMIT = 256 * 1024 * 1024
+HR_QUESTIONS_CACHE_TTL = 24 * 60 * 60
+
+# Hints are only generated when a candidate opens the tips panel
+HINTS_PER_QUESTION = 5
+
+# Only this much of the resume (UTF-8 bytes) goes into the prompt, so it's also all the
+# cache key needs. Bytes rather than characters keep the payload size fixed for non-ASCII resumes
+RESUME_PROMPT_BYTES = 4000
+
+def _resume_excerpt(resume_text: str) -> str:
+    """Truncate the resume to RESUME_PROMPT_BYTES of UTF-8 without splitting a character."""
+    # A char is at least one byte, so pre-slicing bounds the encode to the excerpt, not the whole resume
+    encoded = resume_text[:RESUME_PROMPT_BYTES].encode("utf-8")[:RESUME_PROMPT_BYTES]
+    return encoded.decode("utf-8", errors="ignore")
+
+class HRQuestion(BaseModel):
+    """One generated HR question, as returned by Gemini. Hints are fetched separately."""
+    question: str
+    category: str
+    purpose: str
+    difficulty: str
+
+class HRQuestionsResponse(BaseModel):
+    """The full question-generation response."""
+    hr_questions: list[HRQuestion]
+    focus_areas: list[str]
+
+# JSON mode: Gemini returns bare JSON in the HRQuestionsResponse shape. Kept as a
+# precomputed dict so the SDK doesn't rebuild the schema from the class on every call
+_HR_QUESTIONS_RESPONSE_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "hr_questions": {
+            "type": "ARRAY",
+            "items": {
+                "type": "OBJECT",
+                "properties": {
+                    "question": {"type": "STRING"},
+                    "category": {"type": "STRING"},
+                    "purpose": {"type": "STRING"},
+                    "difficulty": {"type": "STRING"},
+                },
+                "required": ["question", "category", "purpose", "difficulty"],
+            },
+        },
+        "focus_areas": {"type": "ARRAY", "items": {"type": "STRING"}},
+    },
+    "required": ["hr_questions", "focus_areas"],
+}
+
+_HR_QUESTIONS_GENERATION_CONFIG = {
+    "response_mime_type": "application/json",
+    "response_schema": _HR_QUESTIONS_RESPONSE_SCHEMA,
+}
+
+# Identical for every request; as the system instruction it forms a fixed prefix ahead
+# of the per-resume content, which Gemini's prompt caching can reuse
+_HR_QUESTIONS_SYSTEM_INSTRUCTION = """You are an HR interviewer. Analyze the candidate's resume and generate 8 personalized HR interview questions focusing on:
+1. Self-introduction and background
+2. Company knowledge and motivation
+3. Career goals and aspirations
+4. Behavioral and situational questions
+5. Questions based on extracurricular activities, achievements, and positions of responsibility mentioned in resume
+
+Return ONLY a JSON object with this exact structure:
+{
+    "hr_questions": [
+        {
+            "question": "the question text",
+            "category": "introduction|company_knowledge|career_goals|behavioral|achievements|extracurricular",
+            "purpose": "brief explanation of what this question assesses",
+            "difficulty": "easy|medium|hard"
+        }
+    ],
+    "focus_areas": ["area1", "area2", "area3"]
+}
+
+Make questions personalized based on the resume content. For example:
+- If resume mentions leadership positions, ask about leadership experiences
+- If resume shows achievements, ask about the journey to those achievements
+- If resume has extracurricular activities, ask about transferable skills
+"""
+
+_HR_QUESTIONS_PROMPT_TEMPLATE = """RESUME TEXT:
+{resume_text}
+
+JOB DESCRIPTION:
+{job_description}
+
+Generate the questions now:"""
+
+class HRHintsResponse(BaseModel):
+    """Answering tips for a single question."""
+    hints: list[str]
+
+_HR_HINTS_GENERATION_CONFIG = {
+    "response_mime_type": "application/json",
+    "response_schema": {
+        "type": "OBJECT",
+        "properties": {"hints": {"type": "ARRAY", "items": {"type": "STRING"}}},
+        "required": ["hints"],
+    },
+}
+
+_HR_HINTS_SYSTEM_INSTRUCTION = f"""You are an HR interview coach. Given one HR interview question, return {HINTS_PER_QUESTION} short, actionable tips for answering it.
+
+IMPORTANT:
+- Make hints SPECIFIC to the question (not generic advice)
+- Example: For "Tell me about yourself" → hints about career journey, hobbies, interests
+- Example: For "Why this company" → hints about researching company, aligning values
+
+Return ONLY a JSON object: {{"hints": ["tip 1", "tip 2", ...]}}
+"""
+
+_DEFAULT_HINTS = [
+    "Use the STAR method: Situation, Task, Action, Result",
+    "Give a specific, real example from your experience",
+    "Focus on what YOU did and what you learned",
+    "Connect your answer to the role you're applying for",
+    "Keep it concise - aim for 1-2 minutes"
+]
+
+# Static question sets, built once; the getters hand out copies so callers can't
+# mutate the shared data
+_FALLBACK_HR_QUESTIONS = {
+    "hr_questions": [
+        {
+            "question": "Can you walk me through your resume and highlight key experiences that make you a good fit for this role?",
+            "category": "introduction",
+            "purpose": "Assess communication skills and self-awareness",
+            "difficulty": "medium",
+            "hints": [
+                "Start with your current role/education, then work backwards",
+                "Highlight 2-3 key achievements or projects relevant to this role",
+                "Connect your experiences to the job requirements",
+                "Keep it concise - aim for 2-3 minutes",
+                "End with why you're excited about this opportunity"
+            ]
+        },
+        {
+            "question": "What do you know about our company and why do you want to work here?",
+            "category": "company_knowledge", 
+            "purpose": "Evaluate research skills and genuine interest",
+            "difficulty": "medium",
+            "hints": [
+                "Mention specific products, services, or recent news about the company",
+                "Connect company values/mission with your personal values",
+                "Show you've researched their culture and work environment",
+                "Explain how this role aligns with your career goals",
+                "Be genuine - don't just praise, show understanding"
+            ]
+        },
+        {
+            "question": "Where do you see yourself in the next 5 years?",
+            "category": "career_goals",
+            "purpose": "Understand long-term career aspirations",
+            "difficulty": "easy",
+            "hints": [
+                "Show ambition but be realistic about the timeline",
+                "Align your goals with potential growth in this company",
+                "Mention skills you want to develop and leadership aspirations",
+                "Avoid saying you want their boss's job or to leave soon",
+                "Focus on professional growth, not just titles"
+            ]
+        },
+        {
+            "question": "Tell me about a time you faced a significant challenge and how you overcame it.",
+            "category": "behavioral",
+            "purpose": "Assess problem-solving and resilience",
+            "difficulty": "medium",
+            "hints": [
+                "Use STAR method: Situation, Task, Action, Result",
+                "Choose a real challenge (academic project, work conflict, deadline pressure)",
+                "Focus on YOUR actions, not what the team did",
+                "Include specific steps you took to solve the problem",
+                "End with measurable results and what you learned"
+            ]
+        },
+        {
+            "question": "What achievement are you most proud of and why?",
+            "category": "achievements",
+            "purpose": "Understand values and motivation drivers",
+            "difficulty": "medium",
+            "hints": [
+                "Pick an achievement relevant to the job (project, award, leadership role)",
+                "Explain the context and why it was challenging",
+                "Describe your specific contribution and effort",
+                "Quantify the impact (improved X by Y%, led team of Z)",
+                "Share why it matters to you personally"
+            ]
+        },
+        {
+            "question": "How do your extracurricular activities contribute to your professional development?",
+            "category": "extracurricular", 
+            "purpose": "Assess transferable skills and work-life balance",
+            "difficulty": "medium",
+            "hints": [
+                "Connect activities to skills needed for the job (leadership, teamwork, time management)",
+                "Give specific examples (sports → discipline, clubs → collaboration)",
+                "Show how these activities shaped your personality",
+                "Mention any leadership roles or organizing responsibilities",
+                "Demonstrate balance between work/studies and personal interests"
+            ]
+        },
+        {
+            "question": "Describe a situation where you had to take leadership responsibility. What did you learn?",
+            "category": "behavioral",
+            "purpose": "Evaluate leadership potential and learning ability", 
+            "difficulty": "hard",
+            "hints": [
+                "Choose a specific instance where you led a team or project",
+                "Explain the challenge and your leadership approach",
+                "Describe how you motivated team members and resolved conflicts",
+                "Share measurable outcomes (delivered on time, achieved X result)",
+                "Reflect on lessons learned about leadership and yourself"
+            ]
+        },
+        {
+            "question": "What motivates you to perform at your best?",
+            "category": "behavioral",
+            "purpose": "Understand intrinsic motivation factors",
+            "difficulty": "easy",
+            "hints": [
+                "Be honest about what drives you (learning, impact, recognition, challenges)",
+                "Give examples of when you felt most motivated",
+                "Connect your motivations to this role and company",
+                "Avoid generic answers like 'money' - focus on growth and purpose",
+                "Show self-awareness about what energizes you"
+            ]
+        }
+    ],
+    "focus_areas": ["Communication", "Motivation", "Career Goals", "Leadership", "Achievements"]
+}
+
+_COMMON_HR_QUESTIONS = [
+    {
+        "question": "Tell me about yourself.",
+        "category": "introduction",
+        "purpose": "Ice breaker and overview of candidate",
+        "difficulty": "easy",
+        "hints": [
+            "Start with current role/education and career journey",
+            "Mention 2-3 key achievements or skills",
+            "Include hobbies or interests that show your personality",
+            "Connect your background to why you're here today",
+            "Keep it professional but personable (2-3 minutes max)"
+        ]
+    },
+    {
+        "question": "Why should we hire you?",
+        "category": "self_promotion", 
+        "purpose": "Assess self-awareness and value proposition",
+        "difficulty": "medium",
+        "hints": [
+            "Match your skills directly to the job requirements",
+            "Highlight unique strengths or experiences you bring",
+            "Give 2-3 specific examples of past successes",
+            "Show enthusiasm and cultural fit with the company",
+            "Be confident but not arrogant"
+        ]
+    },
+    {
+        "question": "What are your strengths and weaknesses?",
+        "category": "self_awareness",
+        "purpose": "Evaluate self-assessment and honesty", 
+        "difficulty": "medium",
+        "hints": [
+            "For strengths: Pick 2-3 relevant to the job with examples",
+            "For weaknesses: Be honest but choose something minor",
+            "Show you're actively working to improve the weakness",
+            "Don't say 'I'm a perfectionist' - it's overused",
+            "Balance honesty with confidence"
+        ]
+    },
+    {
+        "question": "How do you handle pressure and tight deadlines?",
+        "category": "behavioral",
+        "purpose": "Assess stress management skills",
+        "difficulty": "medium",
+        "hints": [
+            "Share a specific example of working under pressure",
+            "Describe your prioritization and time management approach",
+            "Mention techniques you use (planning, breaks, asking for help)",
+            "Show the successful outcome despite the pressure",
+            "Demonstrate you stay calm and focused"
+        ]
+    },
+    {
+        "question": "What are your salary expectations?",
+        "category": "compensation", 
+        "purpose": "Understand compensation alignment",
+        "difficulty": "hard",
+        "hints": [
+            "Research market rates for this role in your location",
+            "Provide a salary range, not a fixed number",
+            "Consider total compensation (benefits, growth opportunities)",
+            "Be flexible and open to negotiation",
+            "Focus on value you bring, not just your needs"
+        ]
+    }
+]
+
+# Serialized once; decoding these hands each caller a fresh copy without deepcopy's overhead
+_FALLBACK_HR_QUESTIONS_JSON = orjson.dumps(_FALLBACK_HR_QUESTIONS)
+_COMMON_HR_QUESTIONS_JSON = orjson.dumps(_COMMON_HR_QUESTIONS)
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+def _normalize_for_cache(text: str) -> str:
+    """Lowercase and collapse whitespace, which PDF/DOCX extraction varies freely."""
+    return _WHITESPACE_RE.sub(" ", text).strip().lower()
+
+# The static sets already carry hand-written hints, so those questions never need a Gemini call
+_STATIC_HINTS = {
+    _normalize_for_cache(q["question"]): tuple(q["hints"])
+    for q in _FALLBACK_HR_QUESTIONS["hr_questions"] + _COMMON_HR_QUESTIONS
+}
+
+GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
+
+@lru_cache(maxsize=1)
+def _get_hr_questions_model() -> Optional[genai.GenerativeModel]:
+    """Configures the Gemini SDK once and returns the shared question model, or None without a key."""
+    if not GEMINI_API_KEY:
+        return None
+    configure_gemini()
+    return genai.GenerativeModel(
+        'gemini-2.5-flash',
+        system_instruction=_HR_QUESTIONS_SYSTEM_INSTRUCTION,
+        generation_config=_HR_QUESTIONS_GENERATION_CONFIG
+    )
+
+@lru_cache(maxsize=1)
+def _get_hr_hints_model() -> Optional[genai.GenerativeModel]:
+    """Shared model for the small per-question hints call, or None without a key."""
+    if not GEMINI_API_KEY:
+        return None
+    configure_gemini()
+    return genai.GenerativeModel(
+        'gemini-2.5-flash',
+        system_instruction=_HR_HINTS_SYSTEM_INSTRUCTION,
+        generation_config=_HR_HINTS_GENERATION_CONFIG
+    )
+
 class HRQuestionGenerator:
     def __init__(self):
-        self.gemini_api_key = os.getenv("GEMINI_API_KEY")
-        if self.gemini_api_key:
-            genai.configure(api_key=self.gemini_api_key)
-            self.model = genai.GenerativeModel('gemini-2.5-flash')
-        else:
-            self.model = None
-
-    def get_hr_questions_based_on_resume(self, resume_text: str, job_description: str = "") -> Dict[str, Any]:
+        self.gemini_api_key = GEMINI_API_KEY
+        self.model = _get_hr_questions_model()
+        # Gemini responses (as JSON bytes) keyed by prompt inputs; identical resumes skip the LLM call.
+        # diskcache is SQLite-backed and safe to share between threads and uvicorn worker processes.
+        # Its reads and writes block on disk, so async code calls them through asyncio.to_thread
+        os.makedirs(HR_QUESTIONS_CACHE_DIR, mode=0o700, exist_ok=True)
+        self._response_cache = Cache(HR_QUESTIONS_CACHE_DIR, size_limit=HR_QUESTIONS_CACHE_SIZE_LIMIT)
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._gemini_semaphore = asyncio.Semaphore(MAX_CONCURRENT_GEMINI_CALLS)
+        self.hints_model = _get_hr_hints_model()
+        # Hints depend only on the question text, so they're shared across candidates
+        self._hints_cache = LRUCache(maxsize=2048)
+        self._hints_inflight: Dict[str, asyncio.Future] = {}
+
+    async def warm_up(self) -> None:
+        """
+        Open the SDK's shared async gRPC channel before the first real request, so
+        the first resume upload doesn't pay for the TCP/TLS handshake
+        """
+        if not self.model:
+            return
+        try:
+            # count_tokens is free and goes over the same channel generate_content_async uses
+            await self.model.count_tokens_async("warm-up", request_options=WARM_UP_REQUEST_OPTIONS)
+        except Exception:
+            logger.warning("Gemini warm-up failed; the channel will be opened on first use", exc_info=True)
+
+    @staticmethod
+    def _response_cache_key(resume_text: str, job_description: str) -> str:
+        # Normalized so re-exported or reformatted copies of the same resume share an entry
+        resume = _normalize_for_cache(_resume_excerpt(resume_text))
+        payload = f"{resume}|{_normalize_for_cache(job_description)}"
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    async def get_hr_questions_based_on_resume(self, resume_text: str, job_description: str = "") -> Dict[str, Any]:
         """
         Generate personalized HR questions based on resume content
         """
         if not self.gemini_api_key or not self.model:
             return self.get_fallback_hr_questions()
 
+        cache_key = self._response_cache_key(resume_text, job_description)
+        cached = await asyncio.to_thread(self._response_cache.get, cache_key)
+        if cached is not None:
+            # Decoding the stored bytes gives each caller its own copy, faster than deepcopy
+            return orjson.loads(cached)
+
+        # Concurrent requests for the same resume share one Gemini call
+        hr_questions_json = await run_coalesced(
+            self._inflight, cache_key,
+            lambda: self._generate_hr_questions(resume_text, job_description, cache_key)
+        )
+        return orjson.loads(hr_questions_json)
+
+    async def _generate_hr_questions(self, resume_text: str, job_description: str, cache_key: str) -> bytes:
+        """Call Gemini for the question set as JSON bytes, caching only successful responses"""
         try:
-            prompt = f"""
-            Analyze this resume and generate 8 personalized HR interview questions focusing on:
-            1. Self-introduction and background
-            2. Company knowledge and motivation
-            3. Career goals and aspirations
-            4. Behavioral and situational questions
-            5. Questions based on extracurricular activities, achievements, and positions of responsibility mentioned in resume
-            
-            RESUME TEXT:
-            {resume_text[:4000]}
-            
-            JOB DESCRIPTION:
-            {job_description or 'General professional role'}
+            prompt = _HR_QUESTIONS_PROMPT_TEMPLATE.format(
+                resume_text=_resume_excerpt(resume_text),
+                job_description=job_description or 'General professional role'
+            )
             
-            Return ONLY a JSON object with this exact structure:
-            {{
-                "hr_questions": [
-                    {{
-                        "question": "the question text",
-                        "category": "introduction|company_knowledge|career_goals|behavioral|achievements|extracurricular",
-                        "purpose": "brief explanation of what this question assesses",
-                        "difficulty": "easy|medium|hard",
-                        "hints": [
-                            "Specific hint 1 for THIS question",
-                            "Specific hint 2 for THIS question",
-                            "Specific hint 3 for THIS question",
-                            "Specific hint 4 for THIS question",
-                            "Specific hint 5 for THIS question"
-                        ]
-                    }}
-                ],
-                "focus_areas": ["area1", "area2", "area3"]
-            }}
+            # Awaited so the event loop keeps serving other requests during the Gemini call;
+            # the semaphore keeps a burst of uploads inside the API rate limit
+            async with self._gemini_semaphore:
+                response = await self.model.generate_content_async(prompt)
+            # Parsed and validated in one pydantic-core pass; a reply missing fields goes to the fallback
+            hr_questions_json = HRQuestionsResponse.model_validate_json(response.text).model_dump_json().encode()
+            await asyncio.to_thread(
+                self._response_cache.set, cache_key, hr_questions_json, expire=HR_QUESTIONS_CACHE_TTL
+            )
+            return hr_questions_json
             
-            IMPORTANT: 
-            - Make hints SPECIFIC to each question (not generic advice)
-            - Keep hints short and actionable (5 points per question)
-            - Example: For "Tell me about yourself" → hints about career journey, hobbies, interests
-            - Example: For "Why this company" → hints about researching company, aligning values
-            - Personalize based on resume content when possible
-            
-            Make questions personalized based on the resume content. For example:
-            - If resume mentions leadership positions, ask about leadership experiences
-            - If resume shows achievements, ask about the journey to those achievements
-            - If resume has extracurricular activities, ask about transferable skills
-            
-            Generate the questions now:
-            """
-            
-            response = self.model.generate_content(prompt)
-            ai_response = response.text.strip()
-            
-            # Clean the response
-            cleaned_response = self.clean_ai_response(ai_response)
-            return json.loads(cleaned_response)
-            
-        except Exception as e:
-            print(f"HR question generation failed: {e}")
-            return self.get_fallback_hr_questions()
+        except Exception:
+            logger.exception("HR question generation failed")
+            return _FALLBACK_HR_QUESTIONS_JSON
+
+    async def get_hints(self, question: str) -> List[str]:
+        """
+        Answering tips for one question, generated on demand when the candidate asks for them
+        """
+        cache_key = _normalize_for_cache(question)
+        static_hints = _STATIC_HINTS.get(cache_key)
+        if static_hints is not None:
+            return list(static_hints)
+        if not self.hints_model:
+            return list(_DEFAULT_HINTS)
 
-    def clean_ai_response(self, response: str) -> str:
-        """Clean AI response by removing markdown formatting"""
-        if response.startswith("```json"):
-            response = response[7:]
-        if response.endswith("```"):
-            response = response[:-3]
-        return response.strip()
+        cached = self._hints_cache.get(cache_key)
+        if cached is not None:
+            return list(cached)
+
+        hints = await run_coalesced(
+            self._hints_inflight, cache_key, lambda: self._generate_hints(question, cache_key)
+        )
+        return list(hints)
+
+    async def _generate_hints(self, question: str, cache_key: str) -> List[str]:
+        """Call Gemini for one question's hints, caching only successful responses"""
+        try:
+            async with self._gemini_semaphore:
+                response = await self.hints_model.generate_content_async(question)
+            hints = HRHintsResponse.model_validate_json(response.text).hints[:HINTS_PER_QUESTION]
+            if not hints:
+                return _DEFAULT_HINTS
+            self._hints_cache[cache_key] = hints
+            return hints
+
+        except Exception:
+            logger.exception("HR hint generation failed")
+            return _DEFAULT_HINTS
+
+    def is_fallback_hr_questions(self, hr_questions_data: Dict[str, Any]) -> bool:
+        """True if the data is the static fallback set rather than a generated one"""
+        return hr_questions_data == _FALLBACK_HR_QUESTIONS
 
     def get_fallback_hr_questions(self) -> Dict[str, Any]:
         """Fallback HR questions if AI fails"""
-        return {
-            "hr_questions": [
-                {
-                    "question": "Can you walk me through your resume and highlight key experiences that make you a good fit for this role?",
-                    "category": "introduction",
-                    "purpose": "Assess communication skills and self-awareness",
-                    "difficulty": "medium",
-                    "hints": [
-                        "Start with your current role/education, then work backwards",
-                        "Highlight 2-3 key achievements or projects relevant to this role",
-                        "Connect your experiences to the job requirements",
-                        "Keep it concise - aim for 2-3 minutes",
-                        "End with why you're excited about this opportunity"
-                    ]
-                },
-                {
-                    "question": "What do you know about our company and why do you want to work here?",
-                    "category": "company_knowledge", 
-                    "purpose": "Evaluate research skills and genuine interest",
-                    "difficulty": "medium",
-                    "hints": [
-                        "Mention specific products, services, or recent news about the company",
-                        "Connect company values/mission with your personal values",
-                        "Show you've researched their culture and work environment",
-                        "Explain how this role aligns with your career goals",
-                        "Be genuine - don't just praise, show understanding"
-                    ]
-                },
-                {
-                    "question": "Where do you see yourself in the next 5 years?",
-                    "category": "career_goals",
-                    "purpose": "Understand long-term career aspirations",
-                    "difficulty": "easy",
-                    "hints": [
-                        "Show ambition but be realistic about the timeline",
-                        "Align your goals with potential growth in this company",
-                        "Mention skills you want to develop and leadership aspirations",
-                        "Avoid saying you want their boss's job or to leave soon",
-                        "Focus on professional growth, not just titles"
-                    ]
-                },
-                {
-                    "question": "Tell me about a time you faced a significant challenge and how you overcame it.",
-                    "category": "behavioral",
-                    "purpose": "Assess problem-solving and resilience",
-                    "difficulty": "medium",
-                    "hints": [
-                        "Use STAR method: Situation, Task, Action, Result",
-                        "Choose a real challenge (academic project, work conflict, deadline pressure)",
-                        "Focus on YOUR actions, not what the team did",
-                        "Include specific steps you took to solve the problem",
-                        "End with measurable results and what you learned"
-                    ]
-                },
-                {
-                    "question": "What achievement are you most proud of and why?",
-                    "category": "achievements",
-                    "purpose": "Understand values and motivation drivers",
-                    "difficulty": "medium",
-                    "hints": [
-                        "Pick an achievement relevant to the job (project, award, leadership role)",
-                        "Explain the context and why it was challenging",
-                        "Describe your specific contribution and effort",
-                        "Quantify the impact (improved X by Y%, led team of Z)",
-                        "Share why it matters to you personally"
-                    ]
-                },
-                {
-                    "question": "How do your extracurricular activities contribute to your professional development?",
-                    "category": "extracurricular", 
-                    "purpose": "Assess transferable skills and work-life balance",
-                    "difficulty": "medium",
-                    "hints": [
-                        "Connect activities to skills needed for the job (leadership, teamwork, time management)",
-                        "Give specific examples (sports → discipline, clubs → collaboration)",
-                        "Show how these activities shaped your personality",
-                        "Mention any leadership roles or organizing responsibilities",
-                        "Demonstrate balance between work/studies and personal interests"
-                    ]
-                },
-                {
-                    "question": "Describe a situation where you had to take leadership responsibility. What did you learn?",
-                    "category": "behavioral",
-                    "purpose": "Evaluate leadership potential and learning ability", 
-                    "difficulty": "hard",
-                    "hints": [
-                        "Choose a specific instance where you led a team or project",
-                        "Explain the challenge and your leadership approach",
-                        "Describe how you motivated team members and resolved conflicts",
-                        "Share measurable outcomes (delivered on time, achieved X result)",
-                        "Reflect on lessons learned about leadership and yourself"
-                    ]
-                },
-                {
-                    "question": "What motivates you to perform at your best?",
-                    "category": "behavioral",
-                    "purpose": "Understand intrinsic motivation factors",
-                    "difficulty": "easy",
-                    "hints": [
-                        "Be honest about what drives you (learning, impact, recognition, challenges)",
-                        "Give examples of when you felt most motivated",
-                        "Connect your motivations to this role and company",
-                        "Avoid generic answers like 'money' - focus on growth and purpose",
-                        "Show self-awareness about what energizes you"
-                    ]
-                }
-            ],
-            "focus_areas": ["Communication", "Motivation", "Career Goals", "Leadership", "Achievements"]
-        }
+        return orjson.loads(_FALLBACK_HR_QUESTIONS_JSON)
 
     def get_common_hr_questions(self) -> List[Dict[str, str]]:
         """Get common HR questions that are always relevant"""
-        return [
-            {
-                "question": "Tell me about yourself.",
-                "category": "introduction",
-                "purpose": "Ice breaker and overview of candidate",
-                "difficulty": "easy",
-                "hints": [
-                    "Start with current role/education and career journey",
-                    "Mention 2-3 key achievements or skills",
-                    "Include hobbies or interests that show your personality",
-                    "Connect your background to why you're here today",
-                    "Keep it professional but personable (2-3 minutes max)"
-                ]
-            },
-            {
-                "question": "Why should we hire you?",
-                "category": "self_promotion", 
-                "purpose": "Assess self-awareness and value proposition",
-                "difficulty": "medium",
-                "hints": [
-                    "Match your skills directly to the job requirements",
-                    "Highlight unique strengths or experiences you bring",
-                    "Give 2-3 specific examples of past successes",
-                    "Show enthusiasm and cultural fit with the company",
-                    "Be confident but not arrogant"
-                ]
-            },
-            {
-                "question": "What are your strengths and weaknesses?",
-                "category": "self_awareness",
-                "purpose": "Evaluate self-assessment and honesty", 
-                "difficulty": "medium",
-                "hints": [
-                    "For strengths: Pick 2-3 relevant to the job with examples",
-                    "For weaknesses: Be honest but choose something minor",
-                    "Show you're actively working to improve the weakness",
-                    "Don't say 'I'm a perfectionist' - it's overused",
-                    "Balance honesty with confidence"
-                ]
-            },
-            {
-                "question": "How do you handle pressure and tight deadlines?",
-                "category": "behavioral",
-                "purpose": "Assess stress management skills",
-                "difficulty": "medium",
-                "hints": [
-                    "Share a specific example of working under pressure",
-                    "Describe your prioritization and time management approach",
-                    "Mention techniques you use (planning, breaks, asking for help)",
-                    "Show the successful outcome despite the pressure",
-                    "Demonstrate you stay calm and focused"
-                ]
-            },
-            {
-                "question": "What are your salary expectations?",
-                "category": "compensation", 
-                "purpose": "Understand compensation alignment",
-                "difficulty": "hard",
-                "hints": [
-                    "Research market rates for this role in your location",
-                    "Provide a salary range, not a fixed number",
-                    "Consider total compensation (benefits, growth opportunities)",
-                    "Be flexible and open to negotiation",
-                    "Focus on value you bring, not just your needs"
-                ]
-            }
-        ]
\ No newline at end of file
+        return orjson.loads(_COMMON_HR_QUESTIONS_JSON)
\ No newline at end of file
@@ -1,35 +1,69 @@
 import os
-import json
-import tempfile
-import shutil
+import asyncio
+import atexit
+import logging
+import multiprocessing
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from concurrent.futures import Future, ProcessPoolExecutor
+import orjson
+import hashlib
+import threading
+from functools import lru_cache
+from itertools import groupby
+from cachetools import TTLCache
 from sqlalchemy import ARRAY 
-from contextlib import contextmanager
 from dotenv import load_dotenv
-from fastapi import FastAPI, UploadFile, File, HTTPException, Depends, Form
+from fastapi import FastAPI, UploadFile, File, HTTPException, Depends, Form, BackgroundTasks, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
-from typing import List, Optional, Generator
-from datetime import datetime
+from typing import Dict, List, Optional, Generator
+from datetime import datetime, timezone
 import uuid
 # Database Imports
-from sqlalchemy import create_engine, Column, Integer, String, Text, ForeignKey, JSON, DateTime
-from sqlalchemy.orm import sessionmaker, declarative_base, relationship, Session
+from sqlalchemy import create_engine, make_url, select, Column, Integer, String, Text, ForeignKey, JSON, DateTime, Index, func, text
+from sqlalchemy.orm import sessionmaker, declarative_base, relationship, Session, deferred, load_only, joinedload, raiseload
 from sqlalchemy.exc import ArgumentError
+from sqlalchemy.pool import NullPool
+from sqlalchemy.dialects.postgresql import JSONB, insert as pg_insert
 from supabase import Client
 import google.generativeai as genai
 
 # Import utility files
 from db_client import get_supabase_client
 from auths_utils import ensure_user_exists as ensure_user_supabase
-from resume_parser import extract_text_from_file
-from gemini_client import get_ats_report 
+from resume_parser import extract_text_from_bytes, extract_short_pdf_text, extract_pdf_pages, configure_worker_logging
+from gemini_client import get_ats_report, get_gemini_model, strip_code_fences, configure_gemini, warm_up_gemini_channel
 from hr_interview_service import HRInterviewService
 
 
-app = FastAPI()
+# Responses are encoded with orjson instead of the stdlib json module
+app = FastAPI(default_response_class=ORJSONResponse)
 
 load_dotenv()
 
+LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+def _configure_logging() -> QueueListener:
+    """Route log records through a queue so handler I/O runs on a background thread,
+    not on the event loop that is serving requests."""
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    root_logger = logging.getLogger()
+    root_logger.addHandler(QueueHandler(log_queue))
+    root_logger.setLevel(logging.WARNING)
+    listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    listener.start()
+    # Flush whatever is still queued on shutdown
+    atexit.register(listener.stop)
+    return listener
+
+log_listener = _configure_logging()
+logger = logging.getLogger(__name__)
+
 # --- 1. ENVIRONMENT & LLM CLIENT SETUP ---
 
 DATABASE_URL = os.getenv("DATABASE_URL", "")
@@ -39,20 +73,20 @@ CLERK_SECRET_KEY = os.getenv("CLERK_SECRET_KEY", "REACT_APP_CLERK_PUBLISHABLE_KE
 
 
 if GEMINI_API_KEY:
-    genai.configure(api_key=GEMINI_API_KEY)
+    configure_gemini()
     try:
         gemini_client = genai.GenerativeModel('gemini-2.5-flash')
-        print("DEBUG: Gemini 2.5  model loaded successfully")
+        logger.debug("Gemini 2.5 model loaded")
     except Exception as e:
         try:
             gemini_client = genai.GenerativeModel('gemini-1.0-pro')
-            print("DEBUG: Gemini 1.0 Pro model loaded successfully")
-        except Exception as e2:
-            print(f"DEBUG: Both Gemini models failed: {e2}")
+            logger.debug("Gemini 1.0 Pro model loaded")
+        except Exception:
+            logger.error("Both Gemini models failed to load", exc_info=True)
             gemini_client = None
 else:
     gemini_client = None
-    print("WARNING: GEMINI_API_KEY not set. AI features will use mock data.")
+    logger.warning("GEMINI_API_KEY not set. AI features will use mock data.")
 
 
 # --- 2. DATABASE CONFIGURATION ---
@@ -60,17 +94,106 @@ else:
 if not DATABASE_URL:
     raise ArgumentError("DATABASE_URL environment variable is missing or empty. Please set it in backend/.env.")
 
+# Pool sizing for Supabase: the session-mode pooler only allows ~15 clients, so keep
+# the pool small and recycle connections before Supavisor drops them.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "3"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "2"))
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+
+def _orjson_dumps(value) -> str:
+    return orjson.dumps(value).decode()
+
+# JSON/JSONB columns (reports, ATS results, question sets) go through orjson's C encoder
+JSON_ENGINE_OPTIONS = {"json_serializer": _orjson_dumps, "json_deserializer": orjson.loads}
+
 try:
-    engine = create_engine(DATABASE_URL, connect_args={"sslmode": "require"}) 
+    db_url = make_url(DATABASE_URL)
+    if db_url.port == 6543:
+        # Transaction-mode pooler (Supavisor) already pools server-side
+        engine = create_engine(
+            db_url,
+            connect_args={"sslmode": "require"},
+            poolclass=NullPool,
+            **JSON_ENGINE_OPTIONS,
+        )
+    else:
+        engine = create_engine(
+            db_url,
+            connect_args={"sslmode": "require"},
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_timeout=DB_POOL_TIMEOUT,
+            pool_recycle=DB_POOL_RECYCLE,
+            pool_pre_ping=True,
+            **JSON_ENGINE_OPTIONS,
+        )
 except ArgumentError as e:
     raise ArgumentError(f"Could not parse SQLAlchemy URL. Check the format: {e}")
 
 Base = declarative_base()
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Sessions live for one request, so instances don't need reloading after commit;
+# keeping them loaded saves a SELECT whenever an endpoint reads a row it just committed
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
 
 # Initialize HR service
 hr_service = HRInterviewService()
 
+# Keeps the warm-up task referenced until it finishes, so it isn't garbage-collected mid-run
+_warm_up_task: Optional[asyncio.Future] = None
+
+@app.on_event("startup")
+async def warm_up_gemini():
+    # The async gRPC channel binds to the running loop, so it has to be opened from here;
+    # the sync channel used by the threadpool endpoints is opened alongside it.
+    # gather schedules both right away; not awaited, so serving doesn't wait on Gemini
+    global _warm_up_task
+    _warm_up_task = asyncio.gather(
+        hr_service.question_generator.warm_up(),
+        asyncio.to_thread(warm_up_gemini_channel),
+    )
+
+# Resume parsing is CPU-bound, so it runs in separate processes that parse in parallel across cores.
+# Workers are spawned, not forked: by the first upload the process has gRPC and logging threads
+# running, and a forked child can hang on locks those threads held
+PARSE_POOL_WORKERS = min(os.cpu_count() or 1, 4)
+PARSE_POOL = ProcessPoolExecutor(
+    max_workers=PARSE_POOL_WORKERS, mp_context=multiprocessing.get_context("spawn"),
+    initializer=configure_worker_logging, initargs=(LOG_FORMAT,)
+)
+
+# Shorter PDFs parse in one call; splitting them costs more in process hand-offs than it saves
+PARALLEL_PARSE_MIN_PAGES = 10
+
+# Uploads are read into memory and copied to the parse pool, so their size is capped
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(5 * 1024 * 1024)))
+
+@app.on_event("shutdown")
+def shutdown_parse_pool():
+    PARSE_POOL.shutdown(cancel_futures=True)
+
+async def extract_resume_text(data: bytes, file_name: str) -> str:
+    """Extract resume text in the parse pool, splitting long PDFs into page ranges parsed in parallel"""
+    loop = asyncio.get_running_loop()
+    if file_name.lower().endswith(".pdf"):
+        # Short PDFs come back parsed from this one call; long ones only report their page count
+        text, page_count = await loop.run_in_executor(
+            PARSE_POOL, extract_short_pdf_text, data, PARALLEL_PARSE_MIN_PAGES
+        )
+        if text is not None:
+            return text
+        # PyMuPDF isn't thread-safe, so each range gets its own process and document handle
+        step = -(-page_count // PARSE_POOL_WORKERS)
+        try:
+            parts = await asyncio.gather(*(
+                loop.run_in_executor(PARSE_POOL, extract_pdf_pages, data, start, start + step)
+                for start in range(0, page_count, step)
+            ))
+            return "\n".join(parts).strip()
+        except Exception:
+            logger.warning("Parallel PDF extraction failed, falling back to a single pass", exc_info=True)
+    return await loop.run_in_executor(PARSE_POOL, extract_text_from_bytes, data, file_name)
+
 # --- 3. DATABASE MODELS ---
 
 class User(Base):
@@ -79,7 +202,7 @@ class User(Base):
     email = Column(Text, unique=True, nullable=False)
     first_name = Column(Text, nullable=True)
     last_name = Column(Text, nullable=True)
-    created_at = Column(DateTime, default=datetime.now)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
     
     resumes = relationship("Resume", back_populates="user")
     sessions = relationship("InterviewSession", back_populates="user")
@@ -88,31 +211,49 @@ class Resume(Base):
     __tablename__ = "resumes"
     resume_id = Column(Text, primary_key=True, default=lambda: str(uuid.uuid4()))
     user_id = Column(Text, ForeignKey("users.user_id"), nullable=False)
-    upload_date = Column(DateTime, default=datetime.now)
+    upload_date = Column(DateTime(timezone=True), server_default=func.now())
     job_role = Column(Text, nullable=True)
-    raw_text = Column(Text, nullable=False)
+    # Deferred: only question generation reads it, and it's the bulk of the row
+    raw_text = deferred(Column(Text, nullable=False))
     job_description = Column(Text, nullable=True)
-    structured_data = Column(JSON, nullable=True)
-    initial_questions = Column(JSON, nullable=True)
-    ats_report = Column(JSON, nullable=True)
+    structured_data = Column(JSONB, nullable=True)
+    initial_questions = Column(JSONB, nullable=True)
+    ats_report = Column(JSONB, nullable=True)
     embedding = Column(JSON, nullable=True)
 
     user = relationship("User", back_populates="resumes")
 
+    # Postgres doesn't index foreign keys automatically; index names match schema.sql
+    __table_args__ = (
+        # Also serves "latest resume for a user": one index probe, read backwards for DESC
+        Index("idx_resumes_user_id_upload_date", "user_id", "upload_date"),
+    )
+
 class InterviewSession(Base):
     __tablename__ = "interview_sessions"
     session_id = Column(Text, primary_key=True, default=lambda: str(uuid.uuid4()))
     user_id = Column(Text, ForeignKey("users.user_id"), nullable=False)
-    start_time = Column(DateTime, default=datetime.now)
-    end_time = Column(DateTime, nullable=True)
+    start_time = Column(DateTime(timezone=True), server_default=func.now())
+    end_time = Column(DateTime(timezone=True), nullable=True)
     difficulty = Column(String, nullable=True)
     topics_covered = Column(ARRAY(Text), nullable=True)  
     final_score = Column(Integer, nullable=True)
-    final_report = Column(Text, nullable=True)
+    final_report = Column(JSONB, nullable=True)
     status = Column(String, default="active")
 
     user = relationship("User", back_populates="sessions")
-    messages = relationship("InterviewMessage", back_populates="session")
+    messages = relationship("InterviewMessage", back_populates="session", order_by="InterviewMessage.timestamp")
+
+    __table_args__ = (
+        # Plain per-user lookups, and a user's sessions newest first; a backward scan serves the DESC order
+        Index("idx_sessions_user_id_start_time", "user_id", "start_time"),
+        # History and stats only read completed sessions; covering their columns allows index-only scans
+        Index(
+            "idx_sessions_user_id_completed_start_time", "user_id", "start_time",
+            postgresql_where=text("status = 'completed'"),
+            postgresql_include=["session_id", "end_time", "difficulty", "topics_covered", "final_score"],
+        ),
+    )
 
 class InterviewMessage(Base):
     __tablename__ = "interview_messages"
@@ -120,7 +261,7 @@ class InterviewMessage(Base):
     session_id = Column(Text, ForeignKey("interview_sessions.session_id"), nullable=False)
     role = Column(String, nullable=False)
     content = Column(Text, nullable=False)
-    timestamp = Column(DateTime, default=datetime.now)
+    timestamp = Column(DateTime(timezone=True), server_default=func.now())
     confidence_score = Column(Integer, nullable=True)
     facial_emotion = Column(String, nullable=True)
     proctoring_flag = Column(String, nullable=True)
@@ -128,6 +269,11 @@ class InterviewMessage(Base):
 
     session = relationship("InterviewSession", back_populates="messages")
 
+    __table_args__ = (
+        # Covers session lookups and returns each session's messages already in timestamp order
+        Index("idx_messages_session_id_timestamp", "session_id", "timestamp"),
+    )
+
 
 class HRInterviewCreate(BaseModel):
     user_id: str
@@ -145,6 +291,13 @@ class HRAnswerSubmit(BaseModel):
     answer: str
     message_id: str  # ID of the question message
 
+class HRHintsRequest(BaseModel):
+    question: str
+
+class HRAnswerAndNextSubmit(HRAnswerSubmit):
+    resume_id: str
+    previous_questions: List[str] = []
+
 # Create tables
 Base.metadata.create_all(bind=engine)
 
@@ -157,33 +310,191 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Reports, session transcripts and history lists compress well; tiny responses aren't worth it
+app.add_middleware(GZipMiddleware, minimum_size=512)
+
 # Dependency injection for the Supabase client
 def get_db_client():
-    """FastAPI Dependency to get the Supabase client."""
+    """FastAPI Dependency to get the shared Supabase client."""
     return get_supabase_client()
 
 
-def get_db():
-    db = SessionLocal()
-    try:
+def get_db() -> Generator[Session, None, None]:
+    # One Session per request, opened and closed by the dependency
+    with SessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
-@contextmanager
-def db_session() -> Generator[Session, None, None]:
-    db = SessionLocal()
+# --- 5. UTILITY FUNCTIONS ---
+
+# Analyses as JSON bytes keyed by resume/JD content, so re-uploading the same resume
+# against the same job skips Gemini; decoding hands each caller its own copy
+_analysis_cache = TTLCache(maxsize=256, ttl=24 * 60 * 60)
+
+def _analysis_cache_key(raw_text: str, job_description: str) -> str:
+    resume_hash = hashlib.sha256(raw_text.encode()).hexdigest()
+    job_hash = hashlib.sha256((job_description or "").encode()).hexdigest()
+    return f"{resume_hash}:{job_hash}"
+
+# Generated technical questions as JSON bytes, keyed by everything that goes into the prompt.
+# generate_question runs on the threadpool, so access goes through the lock
+_question_cache = TTLCache(maxsize=1024, ttl=60 * 60)
+_question_cache_lock = threading.Lock()
+# Gemini calls in progress, so a double-submitted request waits for the first one's result
+_question_inflight: Dict[str, Future] = {}
+
+def _question_cache_key(session_id: str, resume_id: str, difficulty: Optional[str],
+                        topics: Optional[List[str]], previous_questions: List[str]) -> str:
+    # Scoped to the session so separate practice interviews still get fresh questions
+    payload = orjson.dumps([session_id, resume_id, difficulty, topics or [], previous_questions])
+    return hashlib.sha256(payload).hexdigest()
+
+def _generate_question_json(cache_key: str, prompt: str) -> bytes:
+    """Calls Gemini for one question and returns it as JSON bytes, caching the result.
+    Concurrent calls with the same key share the first call; raises if Gemini fails."""
+    with _question_cache_lock:
+        pending = _question_inflight.get(cache_key)
+        is_owner = pending is None
+        if is_owner:
+            pending = _question_inflight[cache_key] = Future()
+    if not is_owner:
+        return pending.result()
+
     try:
-        yield db
+        response = _get_question_model().generate_content(prompt)
+        logger.debug("Gemini raw response: %s", response.text)
+        question_json = orjson.dumps(orjson.loads(response.text))
+        with _question_cache_lock:
+            _question_cache[cache_key] = question_json
+        pending.set_result(question_json)
+        return question_json
+    except Exception as e:
+        pending.set_exception(e)
+        raise
     finally:
-        db.close()
+        with _question_cache_lock:
+            _question_inflight.pop(cache_key, None)
+
+# Same for every call, so it goes in the system instruction; the per-resume content comes
+# last in the user prompt, keeping a stable prefix for Gemini's implicit prompt caching
+_ANALYSIS_SYSTEM_INSTRUCTION = """You are an expert HR and Technical Analyst. Your task is to process a raw resume text and a job description.
+
+First, extract the candidate's core skills, experience, and education into a structured JSON format.
+Second, generate 5 highly personalized and challenging technical interview questions based on the extracted skills and the job description.
+
+Return ONLY a single JSON object with this exact structure:
+{
+    "structured_data": {
+        "skills": ["skill1", "skill2", "skill3"],
+        "experience": "summary of experience",
+        "education": "summary of education"
+    },
+    "initial_questions": [
+        "question 1",
+        "question 2",
+        "question 3",
+        "question 4",
+        "question 5"
+    ]
+}
+"""
 
-# --- 5. UTILITY FUNCTIONS ---
+_ANALYSIS_RESPONSE_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "structured_data": {
+            "type": "OBJECT",
+            "properties": {
+                "skills": {"type": "ARRAY", "items": {"type": "STRING"}},
+                "experience": {"type": "STRING"},
+                "education": {"type": "STRING"},
+            },
+            "required": ["skills", "experience", "education"],
+        },
+        "initial_questions": {"type": "ARRAY", "items": {"type": "STRING"}},
+    },
+    "required": ["structured_data", "initial_questions"],
+}
+
+_ANALYSIS_GENERATION_CONFIG = {
+    "response_mime_type": "application/json",
+    "response_schema": _ANALYSIS_RESPONSE_SCHEMA,
+}
+
+_ANALYSIS_PROMPT_TEMPLATE = """RESUME TEXT:
+{raw_text}
+
+JOB DESCRIPTION:
+{job_description}
+
+Generate the analysis and questions now:"""
+
+@lru_cache(maxsize=1)
+def _get_analysis_model() -> genai.GenerativeModel:
+    """The resume-analysis model with its instructions attached, built once."""
+    return genai.GenerativeModel(
+        'gemini-2.5-flash',
+        system_instruction=_ANALYSIS_SYSTEM_INSTRUCTION,
+        generation_config=_ANALYSIS_GENERATION_CONFIG
+    )
+
+# Characters of resume text included in each technical question prompt
+QUESTION_RESUME_EXCERPT_CHARS = 2000
+
+_QUESTION_SYSTEM_INSTRUCTION = """Generate a technical interview question based on the candidate's resume and job description.
+
+Return ONLY valid JSON with this exact structure:
+{
+    "question": "the generated question text",
+    "category": "relevant technology category",
+    "difficulty": "easy/medium/hard",
+    "expected_answer_points": ["key point 1", "key point 2", "key point 3"]
+}
+"""
+
+_QUESTION_RESPONSE_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "question": {"type": "STRING"},
+        "category": {"type": "STRING"},
+        "difficulty": {"type": "STRING"},
+        "expected_answer_points": {"type": "ARRAY", "items": {"type": "STRING"}},
+    },
+    "required": ["question", "category", "difficulty", "expected_answer_points"],
+}
+
+_QUESTION_GENERATION_CONFIG = {
+    "response_mime_type": "application/json",
+    "response_schema": _QUESTION_RESPONSE_SCHEMA,
+}
+
+# Ordered from most to least stable: the resume and job description repeat for every
+# question in an interview, so they lead; the question history changes on each call and goes last
+_QUESTION_PROMPT_TEMPLATE = """RESUME EXCERPT:
+{resume_excerpt}
+
+JOB DESCRIPTION:
+{job_description}
+
+INTERVIEW CONTEXT:
+- Difficulty Level: {difficulty}
+- Focus Topics: {focus_topics}
+- Previous Questions: {previous_questions}
+
+Generate one unique, personalized technical question:"""
+
+@lru_cache(maxsize=1)
+def _get_question_model() -> genai.GenerativeModel:
+    """The technical-question model with its instructions attached, built once."""
+    return genai.GenerativeModel(
+        'gemini-2.5-flash',
+        system_instruction=_QUESTION_SYSTEM_INSTRUCTION,
+        generation_config=_QUESTION_GENERATION_CONFIG
+    )
 
 def generate_ai_analysis(raw_text: str, job_description: str) -> dict:
     """Calls AI to parse resume and generate questions using Gemini"""
     if not GEMINI_API_KEY or not gemini_client:
-        print("DEBUG: Using mock analysis (no Gemini API key)")
+        logger.debug("Using mock analysis (no Gemini API key)")
         return {
             "structured_data": {
                 "skills": ["JavaScript", "Python", "React", "Node.js"],
@@ -203,54 +514,28 @@ def generate_ai_analysis(raw_text: str, job_description: str) -> dict:
     if len(raw_text) > text_limit:
         raw_text = raw_text[:text_limit] + "..."
 
+    # Keyed on the truncated text, since that's all the prompt sees
+    cache_key = _analysis_cache_key(raw_text, job_description)
+    cached_analysis = _analysis_cache.get(cache_key)
+    if cached_analysis is not None:
+        return orjson.loads(cached_analysis)
+
     try:
-        prompt = f"""
-        You are an expert HR and Technical Analyst. Your task is to process a raw resume text and a job description.
-        
-        First, extract the candidate's core skills, experience, and education into a structured JSON format.
-        Second, generate 5 highly personalized and challenging technical interview questions based on the extracted skills and the job description.
-        
-        RESUME TEXT:
-        {raw_text}
-        
-        JOB DESCRIPTION:
-        {job_description or 'No job description provided'}
-        
-        Return ONLY a single JSON object with this exact structure:
-        {{
-            "structured_data": {{
-                "skills": ["skill1", "skill2", "skill3"],
-                "experience": "summary of experience",
-                "education": "summary of education"
-            }},
-            "initial_questions": [
-                "question 1",
-                "question 2", 
-                "question 3",
-                "question 4",
-                "question 5"
-            ]
-        }}
-        
-        Generate the analysis and questions now:
-        """
-        
-        response = gemini_client.generate_content(prompt)
-        ai_response = response.text
+        prompt = _ANALYSIS_PROMPT_TEMPLATE.format(
+            raw_text=raw_text,
+            job_description=job_description or 'No job description provided'
+        )
         
-        # Clean the response
-        cleaned_response = ai_response.strip()
-        if cleaned_response.startswith("```json"):
-            cleaned_response = cleaned_response[7:]
-        if cleaned_response.endswith("```"):
-            cleaned_response = cleaned_response[:-3]
-        cleaned_response = cleaned_response.strip()
+        response = _get_analysis_model().generate_content(prompt)
         
-        print(f"DEBUG: AI Analysis Response: {cleaned_response}")
-        return json.loads(cleaned_response)
+        # JSON mode guarantees bare JSON in the schema's shape, so no fence stripping
+        logger.debug("AI analysis response: %s", response.text)
+        analysis = orjson.loads(response.text)
+        _analysis_cache[cache_key] = orjson.dumps(analysis)
+        return analysis
         
     except Exception as e:
-        print(f"Gemini API call failed for resume analysis: {e}")
+        logger.exception("Gemini API call failed for resume analysis")
         # fallback
         return {
             "structured_data": {
@@ -266,22 +551,28 @@ def generate_ai_analysis(raw_text: str, job_description: str) -> dict:
                 "What are your career goals?"
             ]
         }   
+# User IDs this process has already inserted or seen, so repeat requests skip the
+# round trip; the TTL bounds how long a deleted user is trusted. Callers run on the threadpool
+_known_users = TTLCache(maxsize=10000, ttl=60 * 60)
+_known_users_lock = threading.Lock()
+
 # Add this function in the UTILITY FUNCTIONS section:
-def ensure_user_exists(db: Session, user_id: str, email: str):
-    """Ensure user exists in database, create if not exists"""
+def ensure_user_exists(db: Session, user_id: str, email: str) -> str:
+    """Ensure user exists in database, create if not exists. Returns the user_id"""
+    with _known_users_lock:
+        if user_id in _known_users:
+            return user_id
     try:
-        user = db.query(User).filter(User.user_id == user_id).first()
-        if not user:
-            user = User(
-                user_id=user_id,
-                email=email,
-                first_name=None,
-                last_name=None
-            )
-            db.add(user)
-            db.commit()
-            db.refresh(user)
-        return user
+        # One INSERT ... ON CONFLICT DO NOTHING instead of SELECT, INSERT and refresh
+        db.execute(
+            pg_insert(User)
+            .values(user_id=user_id, email=email)
+            .on_conflict_do_nothing(index_elements=[User.user_id])
+        )
+        db.commit()
+        with _known_users_lock:
+            _known_users[user_id] = True
+        return user_id
     except Exception as e:
         db.rollback()
         raise e
@@ -297,20 +588,77 @@ class ResumeUploadData(BaseModel):
 def read_root():
     return {"message": "AI Interview System Backend Running"}
 
+# Saved when the background analysis itself fails, so /ats-report/ stops answering 202
+ANALYSIS_FAILED_ATS_REPORT = {
+    "match_score": 0,
+    "missing_keywords": ["Internal Analysis Error"],
+    "suggestions": ["The resume analysis could not be completed. Please upload the resume again."]
+}
+
+async def _update_resume(db_client: Client, resume_id: str, updates: dict) -> None:
+    """Applies column updates to one resume row, off the event loop"""
+    await asyncio.to_thread(
+        db_client.table('resumes')
+        .update(updates)
+        .eq('resume_id', resume_id)
+        .execute
+    )
+
+async def _save_ats_analysis(db_client: Client, resume_id: str, resume_text: str, job_role: str) -> None:
+    """Saves the ATS report as soon as it's ready, or a failure report, so /ats-report/ stops answering 202"""
+    try:
+        ats_report = await get_ats_report(resume_text, job_role)
+    except Exception:
+        logger.exception("ATS analysis failed for resume %s", resume_id)
+        ats_report = ANALYSIS_FAILED_ATS_REPORT
+
+    try:
+        await _update_resume(db_client, resume_id, {'ats_report': ats_report})
+    except Exception:
+        logger.exception("Failed to save the ATS report for resume %s", resume_id)
+        if ats_report is ANALYSIS_FAILED_ATS_REPORT:
+            return
+        try:
+            await _update_resume(db_client, resume_id, {'ats_report': ANALYSIS_FAILED_ATS_REPORT})
+        except Exception:
+            logger.exception("Failed to save the failure ATS report for resume %s", resume_id)
+
+async def _save_hr_questions(db_client: Client, resume_id: str, resume_text: str, job_role: str) -> None:
+    """Stores the HR question set where the HR interview looks for it, so starting one doesn't wait on Gemini"""
+    try:
+        hr_questions_data = await hr_service.question_generator.get_hr_questions_based_on_resume(resume_text, job_role)
+        # The fallback set isn't stored, so the interview can retry the LLM
+        if hr_service.question_generator.is_fallback_hr_questions(hr_questions_data):
+            return
+        await _update_resume(db_client, resume_id, {'initial_questions': hr_questions_data})
+    except Exception:
+        # The HR interview generates its own questions when none are stored
+        logger.exception("Failed to generate HR questions for resume %s", resume_id)
+
+async def run_resume_analysis(db_client: Client, resume_id: str, resume_text: str, job_role: Optional[str]) -> None:
+    """Background task: runs the ATS analysis (when there's a job description) and the HR
+    question generation for a stored resume concurrently. Each result is saved as soon as it
+    is ready, so the ATS report doesn't wait on the slower question generation"""
+    tasks = [_save_hr_questions(db_client, resume_id, resume_text, job_role or "")]
+    if job_role:
+        tasks.append(_save_ats_analysis(db_client, resume_id, resume_text, job_role))
+    await asyncio.gather(*tasks)
+
 @app.post("/upload-resume/")
 async def upload_resume(
+    background_tasks: BackgroundTasks,
+    response: Response,
     file: UploadFile = File(...),
     clerk_user_id: str = Form(..., alias="userId"), 
     job_role: Optional[str] = Form(None, alias="jobDescription"),
-    db_client: Client = Depends(get_db_client),
-    db: Session = Depends(get_db)
+    db_client: Client = Depends(get_db_client)
 ):
     """
     Handles resume file upload, ensures user existence, extracts raw text, 
-    and stores the data in the 'resumes' table.
+    and stores the data in the 'resumes' table. The ATS analysis and HR questions
+    are generated after the response is sent; /ats-report/{user_id} answers 202
+    until the report is saved.
     """
-    temp_file_path = None
-    
     # 1. File Type Validation
     allowed_extensions = {'.pdf', '.docx'}
     _, file_extension = os.path.splitext(file.filename)
@@ -322,73 +670,83 @@ async def upload_resume(
 
     try:
         user_email_placeholder = f"user_{clerk_user_id}@temp.com"
-        user = ensure_user_exists(db, clerk_user_id, user_email_placeholder)
-        user_db_id = user.user_id
         
         # user_email_placeholder = f"user_{clerk_user_id}@temp.com" 
         
         # user = await ensure_user_exists(db_client, clerk_user_id, user_email_placeholder)
         # user_db_id = user['user_id'] # Matches the Clerk ID
         
-        # 3. Save the file temporarily
-        with tempfile.NamedTemporaryFile(delete=False) as temp_file:
-            shutil.copyfileobj(file.file, temp_file)
-            temp_file_path = temp_file.name
+        # 3. Read the upload into memory; resumes are small and both parsers read from bytes.
+        # One byte past the cap is enough to tell an oversized file without reading all of it
+        file_bytes = await file.read(MAX_UPLOAD_BYTES + 1)
+        if len(file_bytes) > MAX_UPLOAD_BYTES:
+            raise HTTPException(
+                status_code=413,
+                detail=f"File too large. The maximum upload size is {MAX_UPLOAD_BYTES // (1024 * 1024)} MB."
+            )
         
-        # 4. Extract raw text
-        extracted_text = extract_text_from_file(temp_file_path, file.filename)
+        # 4. Extract raw text in the parse pool; PDF/DOCX parsing is CPU-bound
+        extracted_text = await extract_resume_text(file_bytes, file.filename)
+        user_db_id = clerk_user_id  # Matches the Clerk ID
         if extracted_text.startswith("Error:") or not extracted_text:
             raise Exception(f"Text extraction failed: {extracted_text}")
 
-        # --- 5. PERFORM ATS ANALYSIS (NEW) ---
-        # The AI needs the raw resume text AND the job description to run.
+        # --- 5. ATS ANALYSIS ---
+        # With a job description the report is generated in the background and saved
+        # onto the row; until then ats_report is NULL
         if not job_role:
              ats_report_result = {"match_score": None, "missing_keywords": [], "suggestions": ["No job description was provided. ATS Scan skipped."]}
         else:
-             ats_report_result = get_ats_report(extracted_text, job_role)
+             ats_report_result = None
 
         # --- 6. Store metadata, raw text, and ATS Report in the 'resumes' table (MODIFIED) ---
-        resume_data = {
-            'user_id': user_db_id,
-            'job_role': job_role, 
-            'raw_text': extracted_text,
-            'ats_report': ats_report_result, 
-        }
-
-        # Insert the data and retrieve the new resume_id
-        store_result = db_client.table('resumes').insert(resume_data).execute()
-        resume_id = store_result.data[0]['resume_id']
+        # The function creates the user row if needed and inserts the resume in one round trip.
+        # supabase-py's execute() is a blocking HTTP call, so it runs off the event loop
+        store_result = await asyncio.to_thread(db_client.rpc('upsert_user_and_insert_resume', {
+            'p_user_id': user_db_id,
+            'p_email': user_email_placeholder,
+            'p_job_role': job_role,
+            'p_raw_text': extracted_text,
+            'p_ats_report': ats_report_result,
+        }).execute)
+        resume_id = store_result.data
+
+        background_tasks.add_task(run_resume_analysis, db_client, resume_id, extracted_text, job_role)
+        if ats_report_result is None:
+            response.status_code = 202
+            return {
+                "status": "pending",
+                "resume_id": resume_id,
+                "user_id": user_db_id,
+                "message": "Resume uploaded and parsed. ATS analysis is running."
+            }
 
         return {
             "status": "success",
             "resume_id": resume_id,
             "user_id": user_db_id,
-            "message": "Resume uploaded, parsed, and AI analysis completed successfully."
+            "message": "Resume uploaded and parsed successfully."
         }
 
     except HTTPException:
         raise
 
     except Exception as e:
-        print(f"An error occurred during resume upload: {e}")
+        logger.exception("An error occurred during resume upload")
         # Return a 500 status on internal error
         raise HTTPException(status_code=500, detail=f"Internal server error: Failed to process resume or save to DB. Detail: {e}")
-    
-    finally:
-        # 6. Clean up the temporary file (ALWAYS runs)
-        if temp_file_path and os.path.exists(temp_file_path):
-            os.remove(temp_file_path)
 
 
 @app.get("/ats-report/{user_id}")
-def get_latest_ats_report(user_id: str, db_client: Client = Depends(get_db_client)):
+def get_latest_ats_report(user_id: str, response: Response, db_client: Client = Depends(get_db_client)):
     """
     Retrieves the most recently uploaded resume entry (which contains the ATS report)
-    for the specified user.
+    for the specified user. Returns 202 while the report is still being generated.
     """
     try:
+        # Only the columns the report page uses; raw_text can be large
         result = db_client.table('resumes')\
-            .select('*')\
+            .select('resume_id, job_role, ats_report, upload_date')\
             .eq('user_id', user_id)\
             .order('upload_date', desc=True)\
             .limit(1)\
@@ -399,6 +757,8 @@ def get_latest_ats_report(user_id: str, db_client: Client = Depends(get_db_clien
 
         # The ats_report field 
         latest_resume = result.data[0]
+        if latest_resume.get('ats_report') is None:
+            response.status_code = 202
         
         # return the data needed for the report page (Report + context)
         return {
@@ -409,7 +769,7 @@ def get_latest_ats_report(user_id: str, db_client: Client = Depends(get_db_clien
         }
 
     except Exception as e:
-        print(f"Error fetching ATS report: {e}")
+        logger.exception("Error fetching ATS report")
         raise HTTPException(status_code=500, detail=f"Failed to fetch report from database. Detail: {e}")
 
 
@@ -435,11 +795,11 @@ class UserAnswer(BaseModel):
 
 # Interview Session Endpoints
 @app.post("/create-interview-session/")
-async def create_interview_session(session_data: InterviewSessionCreate, db: Session = Depends(get_db)):
+def create_interview_session(session_data: InterviewSessionCreate, db: Session = Depends(get_db)):
     """Create a new interview session"""
     try:
-        print(f"DEBUG: Creating session for user: {session_data.user_id}")
-        print(f"DEBUG: Topics received: {session_data.topics}")
+        logger.debug("Creating session for user: %s", session_data.user_id)
+        logger.debug("Topics received: %s", session_data.topics)
         
         # Ensure user exists
         user_email = f"user_{session_data.user_id}@clerk.dev"
@@ -450,7 +810,7 @@ async def create_interview_session(session_data: InterviewSessionCreate, db: Ses
             Resume.user_id == session_data.user_id
         ).order_by(Resume.upload_date.desc()).first()
         
-        print(f"DEBUG: Latest resume found: {latest_resume.resume_id if latest_resume else 'None'}")
+        logger.debug("Latest resume found: %s", latest_resume.resume_id if latest_resume else None)
         
         if not latest_resume:
             raise HTTPException(
@@ -461,16 +821,18 @@ async def create_interview_session(session_data: InterviewSessionCreate, db: Ses
         topics_array = session_data.topics
         if isinstance(topics_array, str):
             try:
-                topics_array = json.loads(topics_array)
+                topics_array = orjson.loads(topics_array)
             except:
                 topics_array = [topics_array]
         elif not isinstance(topics_array, list):
             topics_array = []
         
-        print(f"DEBUG: Topics to be saved: {topics_array}")
+        logger.debug("Topics to be saved: %s", topics_array)
         
-        # Create new session
+        # Create new session (ID generated here, so no refresh() round-trip)
+        session_id = str(uuid.uuid4())
         new_session = InterviewSession(
+            session_id=session_id,
             user_id=session_data.user_id,
             difficulty=session_data.difficulty,
             topics_covered=topics_array, 
@@ -478,12 +840,11 @@ async def create_interview_session(session_data: InterviewSessionCreate, db: Ses
         )
         db.add(new_session)
         db.commit()
-        db.refresh(new_session)
         
-        print(f"DEBUG: Session created with ID: {new_session.session_id}")
+        logger.debug("Session created with ID: %s", session_id)
         return {
             "status": "success",
-            "session_id": new_session.session_id,
+            "session_id": session_id,
             "resume_id": latest_resume.resume_id,
             "message": "Interview session created successfully"
         }
@@ -491,158 +852,159 @@ async def create_interview_session(session_data: InterviewSessionCreate, db: Ses
     except HTTPException:
         raise
     except Exception as e:
-        print(f"DEBUG: Session creation failed: {str(e)}")
+        logger.exception("Session creation failed")
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Failed to create session: {str(e)}")
 
+# Static technical questions for when Gemini is unavailable; {primary_tech} is filled in
+# from the resume or job description
+_FALLBACK_TECH_KEYWORDS = ("python", "javascript", "java", "sql", "react", "node", "aws", "docker")
+
+_FALLBACK_TECHNICAL_QUESTIONS = (
+    {
+        "question": "Based on your experience with {primary_tech}, describe a challenging project you worked on and how you overcame technical obstacles.",
+        "category": "Project Experience",
+        "expected_answer_points": ("Project scope", "Technical challenges", "Your solution", "Results achieved")
+    },
+    {
+        "question": "How do you approach debugging complex issues in your code? Walk me through your methodology.",
+        "category": "Problem Solving",
+        "expected_answer_points": ("Debugging methodology", "Tools used", "Systematic approach", "Prevention strategies")
+    },
+    {
+        "question": "Explain your experience with version control systems and collaborative development workflows.",
+        "category": "Development Practices",
+        "expected_answer_points": ("Version control usage", "Collaboration experience", "Best practices", "Code review process")
+    },
+    {
+        "question": "Describe a situation where you had to learn a new technology quickly to meet project requirements.",
+        "category": "Learning Ability",
+        "expected_answer_points": ("Learning methodology", "Practical application", "Challenges faced", "Outcome achieved")
+    },
+    {
+        "question": "How do you ensure code quality and maintainability in your projects?",
+        "category": "Software Engineering",
+        "expected_answer_points": ("Testing strategies", "Code standards", "Documentation", "Refactoring approach")
+    },
+)
+
+# Lower-cased once for the repeat check; the keywords are lower case, so formatting after lowering matches
+_FALLBACK_TECHNICAL_QUESTIONS_LOWER = tuple(q["question"].lower() for q in _FALLBACK_TECHNICAL_QUESTIONS)
+
 @app.post("/generate-question/")
-async def generate_question(question_request: InterviewQuestionRequest, db: Session = Depends(get_db)):
+def generate_question(question_request: InterviewQuestionRequest, db: Session = Depends(get_db)):
     """Generate the next interview question using Gemini AI"""
     try:
-        print(f"DEBUG: Starting question generation for session {question_request.session_id}")
-        
-        # 1. Get resume and session data
-        resume = db.query(Resume).filter(Resume.resume_id == question_request.resume_id).first()
-        if not resume:
+        logger.debug("Starting question generation for session %s", question_request.session_id)
+        
+        # 1. Get resume and session data: one round trip, only the columns the prompt uses.
+        # The excerpt is cut in SQL so the full resume text doesn't cross the wire
+        context = db.execute(
+            select(
+                func.left(Resume.raw_text, QUESTION_RESUME_EXCERPT_CHARS).label("resume_excerpt"),
+                Resume.job_description,
+                InterviewSession.session_id,
+                InterviewSession.difficulty,
+                InterviewSession.topics_covered,
+            )
+            .outerjoin(InterviewSession, InterviewSession.session_id == question_request.session_id)
+            .where(Resume.resume_id == question_request.resume_id)
+        ).first()
+        # End the read transaction so its pooled connection isn't held while Gemini runs
+        db.commit()
+        if not context:
             raise HTTPException(status_code=404, detail="Resume not found")
-        
-        session = db.query(InterviewSession).filter(InterviewSession.session_id == question_request.session_id).first()
-        if not session:
+        if context.session_id is None:
             raise HTTPException(status_code=404, detail="Session not found")
         
         question_data = None
         ai_source = "none"
         
-        if GEMINI_API_KEY and gemini_client:
+        # A retry from the same point in the same interview gets the question already generated
+        cache_key = _question_cache_key(
+            question_request.session_id, question_request.resume_id, context.difficulty,
+            context.topics_covered, question_request.previous_questions[-3:]
+        )
+        with _question_cache_lock:
+            cached_question = _question_cache.get(cache_key)
+        if cached_question is not None:
+            question_data = orjson.loads(cached_question)
+            ai_source = "cache"
+        
+        if not question_data and GEMINI_API_KEY and gemini_client:
             try:
-                print("DEBUG: Attempting to use Gemini API...")
-                
-                prompt = f"""Generate a technical interview question based on this resume and job description.
-                
-RESUME EXCERPT:
-{resume.raw_text[:2000]}
-
-JOB DESCRIPTION:
-{resume.job_description or 'Technical role'}
-
-INTERVIEW CONTEXT:
-- Difficulty Level: {session.difficulty}
-- Previous Questions: {question_request.previous_questions[-3:] if question_request.previous_questions else 'None'}
-- Focus Topics: {session.topics_covered or []}
-
-Return ONLY valid JSON with this exact structure:
-{{
-    "question": "the generated question text",
-    "category": "relevant technology category",
-    "difficulty": "easy/medium/hard",
-    "expected_answer_points": ["key point 1", "key point 2", "key point 3"]
-}}
-
-Generate one unique, personalized technical question:"""
-                
-                response = gemini_client.generate_content(prompt)
-                ai_response = response.text
-                
-                # Clean the response
-                cleaned_response = ai_response.strip()
-                if cleaned_response.startswith("```json"):
-                    cleaned_response = cleaned_response[7:]
-                if cleaned_response.endswith("```"):
-                    cleaned_response = cleaned_response[:-3]
-                cleaned_response = cleaned_response.strip()
+                logger.debug("Attempting to use Gemini API")
                 
-                print(f"DEBUG: Gemini raw response: {ai_response}")
-                print(f"DEBUG: Gemini cleaned response: {cleaned_response}")
+                prompt = _QUESTION_PROMPT_TEMPLATE.format(
+                    resume_excerpt=context.resume_excerpt,
+                    job_description=context.job_description or 'Technical role',
+                    difficulty=context.difficulty,
+                    focus_topics=context.topics_covered or [],
+                    previous_questions=question_request.previous_questions[-3:] if question_request.previous_questions else 'None'
+                )
                 
-                question_data = json.loads(cleaned_response)
+                question_data = orjson.loads(_generate_question_json(cache_key, prompt))
                 ai_source = "gemini"
-                print("DEBUG: Successfully used Gemini API for question generation")
+                logger.debug("Used Gemini API for question generation")
                 
-            except Exception as gemini_error:
-                print(f"DEBUG: Gemini API failed: {gemini_error}")
+            except Exception:
+                logger.warning("Gemini API failed for question generation, using a fallback question", exc_info=True)
         
         # 3. Enhanced fallback if LLM model fails
         if not question_data:
-            print("DEBUG: Using enhanced fallback questions")
+            logger.debug("Using enhanced fallback questions")
             
-            # Extract some context from resume for better fallbacks
-            resume_lower = resume.raw_text.lower()
-            job_desc_lower = (resume.job_description or "").lower()
+            # Extract some context from resume for better fallbacks; only this path needs the full text
+            raw_text = db.scalar(select(Resume.raw_text).where(Resume.resume_id == question_request.resume_id))
+            resume_lower = (raw_text or "").lower()
+            job_desc_lower = (context.job_description or "").lower()
             
             # Determine primary technology from resume/job description
-            primary_tech = "technical"
-            for tech in ["python", "javascript", "java", "sql", "react", "node", "aws", "docker"]:
-                if tech in resume_lower or tech in job_desc_lower:
-                    primary_tech = tech
-                    break
-            
-            fallback_questions = [
-                {
-                    "question": f"Based on your experience with {primary_tech}, describe a challenging project you worked on and how you overcame technical obstacles.",
-                    "category": "Project Experience",
-                    "difficulty": session.difficulty,
-                    "expected_answer_points": ["Project scope", "Technical challenges", "Your solution", "Results achieved"]
-                },
-                {
-                    "question": "How do you approach debugging complex issues in your code? Walk me through your methodology.",
-                    "category": "Problem Solving", 
-                    "difficulty": session.difficulty,
-                    "expected_answer_points": ["Debugging methodology", "Tools used", "Systematic approach", "Prevention strategies"]
-                },
-                {
-                    "question": "Explain your experience with version control systems and collaborative development workflows.",
-                    "category": "Development Practices",
-                    "difficulty": session.difficulty,
-                    "expected_answer_points": ["Version control usage", "Collaboration experience", "Best practices", "Code review process"]
-                },
-                {
-                    "question": "Describe a situation where you had to learn a new technology quickly to meet project requirements.",
-                    "category": "Learning Ability",
-                    "difficulty": session.difficulty,
-                    "expected_answer_points": ["Learning methodology", "Practical application", "Challenges faced", "Outcome achieved"]
-                },
-                {
-                    "question": "How do you ensure code quality and maintainability in your projects?",
-                    "category": "Software Engineering",
-                    "difficulty": session.difficulty,
-                    "expected_answer_points": ["Testing strategies", "Code standards", "Documentation", "Refactoring approach"]
-                }
-            ]
+            primary_tech = next(
+                (tech for tech in _FALLBACK_TECH_KEYWORDS if tech in resume_lower or tech in job_desc_lower),
+                "technical"
+            )
             
             # Use question history to avoid repeats
-            previous_question_texts = [q.lower() for q in question_request.previous_questions] if question_request.previous_questions else []
-            available_questions = [q for q in fallback_questions 
-                                 if not any(pq in q["question"].lower() for pq in previous_question_texts[-3:])]
+            recent_questions = [q.lower() for q in question_request.previous_questions[-3:]] if question_request.previous_questions else []
+            available_indices = [
+                i for i, text in enumerate(_FALLBACK_TECHNICAL_QUESTIONS_LOWER)
+                if not any(pq in text.format(primary_tech=primary_tech) for pq in recent_questions)
+            ] or range(len(_FALLBACK_TECHNICAL_QUESTIONS))
             
-            if not available_questions:
-                available_questions = fallback_questions
-            
-            question_index = (len(question_request.previous_questions) if question_request.previous_questions else 0) % len(available_questions)
-            question_data = available_questions[question_index]
+            question_index = (len(question_request.previous_questions) if question_request.previous_questions else 0) % len(available_indices)
+            template = _FALLBACK_TECHNICAL_QUESTIONS[available_indices[question_index]]
+            question_data = {
+                "question": template["question"].format(primary_tech=primary_tech),
+                "category": template["category"],
+                "difficulty": context.difficulty,
+                "expected_answer_points": list(template["expected_answer_points"])
+            }
             ai_source = "fallback"
-            print(f"DEBUG: Using enhanced fallback question #{question_index + 1}")
+            logger.debug("Using enhanced fallback question #%d", question_index + 1)
 
-        # 4. Save the question to database
+        # 4. Save the question to database (ID generated here, so no refresh() round-trip)
+        message_id = str(uuid.uuid4())
         ai_message = InterviewMessage(
+            message_id=message_id,
             session_id=question_request.session_id,
             role="ai",
             content=question_data["question"],
-            timestamp=datetime.now()
+            timestamp=datetime.now(timezone.utc)
         )
         db.add(ai_message)
         db.commit()
-        db.refresh(ai_message)
         
         return {
             "status": "success",
             "question": question_data,
-            "message_id": ai_message.message_id,
+            "message_id": message_id,
             "ai_source": ai_source,
             "debug": f"AI Source: {ai_source}"
         }
         
     except Exception as e:
-        print(f"DEBUG: Question generation failed with error: {str(e)}")
+        logger.exception("Question generation failed")
         # Basic fallback in case of complete failure
         basic_question = {
             "question": "Tell me about your most relevant technical experience from your resume.",
@@ -658,47 +1020,59 @@ Generate one unique, personalized technical question:"""
             "debug": f"Error: {str(e)}"
         }
 @app.post("/submit-answer/")
-async def submit_answer(answer_data: UserAnswer, db: Session = Depends(get_db)):
+def submit_answer(answer_data: UserAnswer, db: Session = Depends(get_db)):
     """Submit user's answer and get evaluation"""
     try:
-        print(f"DEBUG: Submitting answer for session {answer_data.session_id}")
+        logger.debug("Submitting answer for session %s", answer_data.session_id)
         
-        # Save user's answer
+        # Save user's answer (ID generated here, so no refresh() round-trip)
+        message_id = str(uuid.uuid4())
         user_message = InterviewMessage(
+            message_id=message_id,
             session_id=answer_data.session_id,
             role="user",
             content=answer_data.answer,
-            timestamp=datetime.now(),
+            timestamp=datetime.now(timezone.utc),
             confidence_score=answer_data.confidence_score,
             facial_emotion=answer_data.facial_emotion  # Fixed field name
         )
         db.add(user_message)
         db.commit()
-        db.refresh(user_message)
         
-        print(f"DEBUG: Answer saved successfully with ID: {user_message.message_id}")
+        logger.debug("Answer saved with ID: %s", message_id)
         
         return {
             "status": "success",
             "message": "Answer submitted successfully",
-            "message_id": user_message.message_id
+            "message_id": message_id
         }
         
     except Exception as e:
-        print(f"DEBUG: Submit answer failed: {str(e)}")
+        logger.exception("Submit answer failed")
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Failed to submit answer: {str(e)}")
 
+def _session_with_messages_options() -> list:
+    """Loader options for the session detail endpoints: the session and its ordered messages
+    in one query, only the columns they return, and an error on any other lazy load"""
+    return [
+        load_only(InterviewSession.session_id, InterviewSession.difficulty,
+                  InterviewSession.start_time, InterviewSession.status),
+        joinedload(InterviewSession.messages).load_only(
+            InterviewMessage.message_id, InterviewMessage.role,
+            InterviewMessage.content, InterviewMessage.timestamp
+        ),
+        raiseload("*"),
+    ]
+
 @app.get("/interview-session/{session_id}")
-async def get_session_details(session_id: str, db: Session = Depends(get_db)):
+def get_session_details(session_id: str, db: Session = Depends(get_db)):
     """Get interview session details and messages"""
-    session = db.query(InterviewSession).filter(InterviewSession.session_id == session_id).first()
+    session = db.get(InterviewSession, session_id, options=_session_with_messages_options())
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
     
-    messages = db.query(InterviewMessage).filter(
-        InterviewMessage.session_id == session_id
-    ).order_by(InterviewMessage.timestamp).all()
+    messages = session.messages
     
     return {
         "session": {
@@ -717,16 +1091,14 @@ async def get_session_details(session_id: str, db: Session = Depends(get_db)):
         ]
     }
 @app.get("/hr-interview-session/{session_id}")
-async def get_hr_interview_session(session_id: str, db: Session = Depends(get_db)):
+def get_hr_interview_session(session_id: str, db: Session = Depends(get_db)):
     """Get HR interview session details"""
     try:        
-        session = db.query(InterviewSession).filter(InterviewSession.session_id == session_id).first()
+        session = db.get(InterviewSession, session_id, options=_session_with_messages_options())
         if not session:
             raise HTTPException(status_code=404, detail="HR interview session not found")
         
-        messages = db.query(InterviewMessage).filter(
-            InterviewMessage.session_id == session_id
-        ).order_by(InterviewMessage.timestamp).all()
+        messages = session.messages
         
         return {
             "session": {
@@ -753,7 +1125,7 @@ async def get_hr_interview_session(session_id: str, db: Session = Depends(get_db
 
   
 @app.get("/debug-resumes/{user_id}")
-async def debug_resumes(user_id: str, db: Session = Depends(get_db)):
+def debug_resumes(user_id: str, db: Session = Depends(get_db)):
     """Debug endpoint to check user's resumes"""
     resumes = db.query(Resume).filter(Resume.user_id == user_id).all()
     return {
@@ -769,7 +1141,7 @@ async def debug_resumes(user_id: str, db: Session = Depends(get_db)):
     }
 
 @app.get("/debug-sessions/{user_id}")
-async def debug_sessions(user_id: str, db: Session = Depends(get_db)):
+def debug_sessions(user_id: str, db: Session = Depends(get_db)):
     """Debug endpoint to check user's sessions"""
     sessions = db.query(InterviewSession).filter(InterviewSession.user_id == user_id).all()
     return {
@@ -786,7 +1158,7 @@ async def debug_sessions(user_id: str, db: Session = Depends(get_db)):
     }
 
 @app.get("/test-gemini")
-async def test_gemini():
+def test_gemini():
     """Test if Gemini API is working"""
     if not GEMINI_API_KEY:
         return {"status": "error", "message": "GEMINI_API_KEY not set"}
@@ -802,39 +1174,25 @@ async def test_gemini():
     except Exception as e:
         return {"status": "error", "message": f"Gemini test failed: {str(e)}"}
 
+def _parse_timestamp(value: str) -> datetime:
+    """Parses a timestamp as PostgREST returns it; fromisoformat only accepts a trailing 'Z' from Python 3.11"""
+    if value[-1] == 'Z':
+        value = value[:-1] + '+00:00'
+    return datetime.fromisoformat(value)
+
 @app.get("/user-stats/{user_id}")
-async def get_user_stats(
+def get_user_stats(
     user_id: str,
     db_client: Client = Depends(get_db_client)
 ):
     
     try:
-        sessions_result = db_client.table('interview_sessions')\
-            .select('session_id, start_time, end_time, final_score, status')\
-            .eq('user_id', user_id)\
-            .eq('status', 'completed')\
-            .execute()
-        
-        sessions = sessions_result.data
-        
-        # Calculate statistics
-        total_interviews = len(sessions)
-        
-        # Calculate average score (only from sessions with final_score)
-        scores = [s['final_score'] for s in sessions if s.get('final_score') is not None]
-        average_score = round(sum(scores) / len(scores)) if scores else None
-        
-        # Calculate total hours practiced
-        total_minutes = 0
-        for session in sessions:
-            if session.get('start_time') and session.get('end_time'):
-                from datetime import datetime
-                start = datetime.fromisoformat(session['start_time'].replace('Z', '+00:00'))
-                end = datetime.fromisoformat(session['end_time'].replace('Z', '+00:00'))
-                duration = (end - start).total_seconds() / 60  # minutes
-                total_minutes += duration
+        # Counted, averaged and summed in Postgres; one row comes back however long the history
+        stats = db_client.rpc('get_user_stats', {'p_user_id': user_id}).execute().data[0]
         
-        total_hours = round(total_minutes / 60, 1)
+        total_interviews = stats['interviews_completed']
+        average_score = stats['average_score']
+        total_hours = round(stats['total_seconds'] / 3600, 1)
         
         return {
             "status": "success",
@@ -846,14 +1204,17 @@ async def get_user_stats(
         }
     
     except Exception as e:
-        print(f"Error fetching user stats: {e}")
+        logger.exception("Error fetching user stats")
         raise HTTPException(
             status_code=500,
             detail=f"Failed to fetch user statistics: {str(e)}"
         )
 
+# Display labels for the stored difficulty values; anything else is capitalized as before
+_DIFFICULTY_LABELS = {"easy": "Easy", "medium": "Medium", "hard": "Hard"}
+
 @app.get("/interview-history/{user_id}")
-async def get_interview_history(
+def get_interview_history(
     user_id: str,
     db_client: Client = Depends(get_db_client)
 ):
@@ -877,10 +1238,8 @@ async def get_interview_history(
         history = []
         for session in sessions:
             # Format date
-            from datetime import datetime
             if session.get('start_time'):
-                date_obj = datetime.fromisoformat(session['start_time'].replace('Z', '+00:00'))
-                formatted_date = date_obj.strftime('%Y-%m-%d')
+                formatted_date = _parse_timestamp(session['start_time']).strftime('%Y-%m-%d')
             else:
                 formatted_date = "N/A"
             
@@ -888,10 +1247,11 @@ async def get_interview_history(
             topics = session.get('topics_covered', [])
             topics_str = ', '.join(topics) if topics else "General"
             
+            difficulty = session.get('difficulty') or 'medium'
             history.append({
                 "date": formatted_date,
                 "score": session.get('final_score'),
-                "level": session.get('difficulty', 'Medium').capitalize(),
+                "level": _DIFFICULTY_LABELS.get(difficulty) or difficulty.capitalize(),
                 "topics": topics_str
             })
         
@@ -901,90 +1261,16 @@ async def get_interview_history(
         }
     
     except Exception as e:
-        print(f"Error fetching interview history: {e}")
+        logger.exception("Error fetching interview history")
         raise HTTPException(
             status_code=500,
             detail=f"Failed to fetch interview history: {str(e)}"
         )
 
-@app.get("/generate-report/{session_id}")
-async def generate_interview_report(
-    session_id: str,
-    db_client: Client = Depends(get_db_client)
-):
-    """
-    Generate a comprehensive interview report using AI.
-    Analyzes the questions asked and answers given during the interview.
-    """
-    try:
-        import google.generativeai as genai
-        from datetime import datetime
-        
-        # Configure Gemini
-        genai.configure(api_key=os.environ.get("GEMINI_API_KEY"))
-        model = genai.GenerativeModel('gemini-2.0-flash-exp')
-        
-        # 1. Get session details
-        session_result = db_client.table('interview_sessions')\
-            .select('user_id, difficulty, topics_covered, start_time, end_time')\
-            .eq('session_id', session_id)\
-            .execute()
-        
-        if not session_result.data or len(session_result.data) == 0:
-            raise HTTPException(status_code=404, detail="Session not found")
-        
-        session = session_result.data[0]
-        
-        # Update end_time if not set
-        if not session.get('end_time'):
-            db_client.table('interview_sessions')\
-                .update({'end_time': datetime.utcnow().isoformat()})\
-                .eq('session_id', session_id)\
-                .execute()
-            session['end_time'] = datetime.utcnow().isoformat()
-        
-        # 2. Get all messages (questions and answers) from this session
-        messages_result = db_client.table('interview_messages')\
-            .select('role, content, timestamp')\
-            .eq('session_id', session_id)\
-            .order('timestamp')\
-            .execute()
-        
-        messages = messages_result.data
-        
-        if not messages or len(messages) == 0:
-            raise HTTPException(status_code=404, detail="No interview data found")
-        
-        # 3. Build conversation context for AI
-        conversation_text = ""
-        qa_pairs = []
-        
-        for i in range(0, len(messages) - 1, 2):
-            if i + 1 < len(messages):
-                question_msg = messages[i] if messages[i]['role'] == 'assistant' else messages[i+1]
-                answer_msg = messages[i+1] if messages[i+1]['role'] == 'user' else messages[i]
-                
-                qa_pairs.append({
-                    "question": question_msg['content'],
-                    "answer": answer_msg['content']
-                })
-                
-                conversation_text += f"\n\nQ: {question_msg['content']}\nA: {answer_msg['content']}"
-        
-        # 4. Use question count as duration estimate (skip timestamp calculation)
-        duration_estimate = len(qa_pairs) * 3  
-        
-        # 5. Create prompt for AI to generate report
-        prompt = f"""
-You are an expert technical interviewer and career coach. Analyze this interview session and provide a comprehensive performance report.
-
-**Interview Details:**
-- Difficulty Level: {session.get('difficulty', 'Medium')}
-- Topics Covered: {', '.join(session.get('topics_covered', [])) if session.get('topics_covered') else 'General'}
-- Questions Answered: {len(qa_pairs)}
-
-**Interview Transcript:**
-{conversation_text}
+# Built once at import; the session details and transcript change per report, so they go
+# last and everything before them is an identical prefix across requests
+_TECHNICAL_REPORT_PROMPT_TEMPLATE = """
+You are an expert technical interviewer and career coach. Analyze the interview session at the end of this prompt and provide a comprehensive performance report.
 
 **Task:**
 Analyze the candidate's responses and provide a detailed performance report in JSON format with the following structure:
@@ -1018,61 +1304,165 @@ Analyze the candidate's responses and provide a detailed performance report in J
 
 Be specific, constructive, and encouraging. Base your assessment on actual responses given.
 Return ONLY the JSON, no markdown formatting.
+
+**Interview Details:**
+- Difficulty Level: {difficulty}
+- Topics Covered: {topics}
+- Questions Answered: {question_count}
+
+**Interview Transcript:**
+{transcript}
 """
 
-        # 6. Call Gemini AI
-        response = model.generate_content(prompt)
-        response_text = response.text.strip()
+# Q/A pairs sent to Gemini for a technical report: the first REPORT_HEAD_QA_PAIRS and the
+# most recent rest, with a marker where the middle was left out
+REPORT_MAX_QA_PAIRS = 20
+REPORT_HEAD_QA_PAIRS = 5
+
+# Questions are saved with role "ai"; "assistant" is accepted too
+_QUESTION_ROLES = frozenset(("ai", "assistant"))
+
+# Reports as JSON bytes keyed by a hash of the session and full prompt, so reopening a finished
+# interview's report skips Gemini while any change to the transcript regenerates it
+_technical_report_cache = TTLCache(maxsize=256, ttl=24 * 60 * 60)
+
+@app.get("/generate-report/{session_id}")
+async def generate_interview_report(
+    session_id: str,
+    db_client: Client = Depends(get_db_client)
+):
+    """
+    Generate a comprehensive interview report using AI.
+    Analyzes the questions asked and answers given during the interview.
+    """
+    try:
+        model = get_gemini_model()
+        
+        # 1-2. Get session details and all messages (questions and answers) together;
+        # both only need the session_id. supabase-py's execute() blocks, so each runs in a thread
+        session_result, messages_result = await asyncio.gather(
+            asyncio.to_thread(
+                db_client.table('interview_sessions')
+                .select('user_id, difficulty, topics_covered, start_time, end_time')
+                .eq('session_id', session_id)
+                .execute
+            ),
+            asyncio.to_thread(
+                db_client.table('interview_messages')
+                .select('role, content, timestamp')
+                .eq('session_id', session_id)
+                .order('timestamp')
+                .execute
+            ),
+        )
         
-        # Remove markdown code blocks if present
-        if response_text.startswith('```json'):
-            response_text = response_text[7:]
-        if response_text.startswith('```'):
-            response_text = response_text[3:]
-        if response_text.endswith('```'):
-            response_text = response_text[:-3]
+        if not session_result.data or len(session_result.data) == 0:
+            raise HTTPException(status_code=404, detail="Session not found")
+        
+        session = session_result.data[0]
+        messages = messages_result.data
         
-        response_text = response_text.strip()
+        if not messages or len(messages) == 0:
+            raise HTTPException(status_code=404, detail="No interview data found")
+        
+        # 3. Build conversation context for AI: consecutive messages from the same side are
+        # merged into one turn, and each question turn is paired with the answer turn after it
+        turns = [
+            (is_question, " ".join(m['content'] for m in group))
+            for is_question, group in groupby(messages, key=lambda m: m['role'] in _QUESTION_ROLES)
+        ]
+        qa_pairs = [
+            {"question": question, "answer": answer}
+            for (is_question, question), (is_answer_question, answer) in zip(turns, turns[1:])
+            if is_question and not is_answer_question
+        ]
+        # Long interviews keep their opening and most recent exchanges; prompt tokens drive
+        # the report's latency and cost, and the middle adds little to the assessment
+        if len(qa_pairs) > REPORT_MAX_QA_PAIRS:
+            tail_count = REPORT_MAX_QA_PAIRS - REPORT_HEAD_QA_PAIRS
+            prompt_pairs = qa_pairs[:REPORT_HEAD_QA_PAIRS] + [None] + qa_pairs[-tail_count:]
+        else:
+            prompt_pairs = qa_pairs
+        conversation_text = "".join(
+            f"\n\nQ: {qa['question']}\nA: {qa['answer']}" if qa is not None
+            else "\n\n... [earlier Q/A omitted] ..."
+            for qa in prompt_pairs
+        )
+        
+        # 4. Use question count as duration estimate (skip timestamp calculation)
+        duration_estimate = len(qa_pairs) * 3  
+        
+        # 5. Create prompt for AI to generate report
+        prompt = _TECHNICAL_REPORT_PROMPT_TEMPLATE.format(
+            difficulty=session.get('difficulty', 'Medium'),
+            topics=', '.join(session.get('topics_covered', [])) if session.get('topics_covered') else 'General',
+            question_count=len(qa_pairs),
+            transcript=conversation_text,
+        )
+
+        # 6. Call Gemini AI (unless this exact transcript was already reported on),
+        # setting end_time meanwhile if it isn't set yet
+        # Scoped to the session: a hit skips saving, so another session's identical transcript must miss
+        report_cache_key = hashlib.sha256(f"{session_id}\n{prompt}".encode()).hexdigest()
+        cached_report = _technical_report_cache.get(report_cache_key)
+        if cached_report is not None:
+            return {"status": "success", "report": orjson.loads(cached_report)}
+
+        calls = [asyncio.to_thread(model.generate_content, prompt)]
+        if not session.get('end_time'):
+            calls.append(asyncio.to_thread(
+                db_client.table('interview_sessions')
+                .update({'end_time': datetime.now(timezone.utc).isoformat()})
+                .eq('session_id', session_id)
+                .execute
+            ))
+        response, *_ = await asyncio.gather(*calls)
+        # Remove markdown code blocks if present
+        response_text = strip_code_fences(response.text)
         
         # Parse AI response
-        report_data = json.loads(response_text)
+        report_data = orjson.loads(response_text)
         
         # 7. Save the report to the session
-        update_result = db_client.table('interview_sessions')\
+        await asyncio.to_thread(
+            db_client.table('interview_sessions')
             .update({
                 'final_report': report_data,
                 'final_score': report_data.get('overall_score', 0),
                 'status': 'completed'
-            })\
-            .eq('session_id', session_id)\
-            .execute()
+            })
+            .eq('session_id', session_id)
+            .execute
+        )
         
         # 8. Return the complete report with session details
+        report = {
+            "overall_score": report_data.get('overall_score', 0),
+            "difficulty": session.get('difficulty', 'Medium'),
+            "topics": session.get('topics_covered', []),
+            "duration": f"~{duration_estimate} minutes",
+            "questions_answered": len(qa_pairs),
+            "total_questions": len(qa_pairs),
+            "category_scores": report_data.get('category_scores', []),
+            "strengths": report_data.get('strengths', []),
+            "improvements": report_data.get('improvements', []),
+            "summary": report_data.get('summary', '')
+        }
+        # Cached only once saved, so a hit never skips writing the report to the session
+        _technical_report_cache[report_cache_key] = orjson.dumps(report)
         return {
             "status": "success",
-            "report": {
-                "overall_score": report_data.get('overall_score', 0),
-                "difficulty": session.get('difficulty', 'Medium'),
-                "topics": session.get('topics_covered', []),
-                "duration": f"~{duration_estimate} minutes",
-                "questions_answered": len(qa_pairs),
-                "total_questions": len(qa_pairs),
-                "category_scores": report_data.get('category_scores', []),
-                "strengths": report_data.get('strengths', []),
-                "improvements": report_data.get('improvements', []),
-                "summary": report_data.get('summary', '')
-            }
+            "report": report
         }
     
-    except json.JSONDecodeError as e:
-        print(f"Error parsing AI response: {e}")
-        print(f"Raw response: {response_text}")
+    except orjson.JSONDecodeError:
+        logger.exception("Error parsing AI response. Raw response: %s", response_text)
         raise HTTPException(
             status_code=500,
             detail="Failed to parse AI response. Please try again."
         )
     except Exception as e:
-        print(f"Error generating report: {e}")
+        logger.exception("Error generating report")
         raise HTTPException(
             status_code=500,
             detail=f"Failed to generate report: {str(e)}"
@@ -1081,7 +1471,7 @@ Return ONLY the JSON, no markdown formatting.
 
 
 @app.post("/create-hr-interview/")
-async def create_hr_interview(interview_data: HRInterviewCreate, db: Session = Depends(get_db)):
+def create_hr_interview(interview_data: HRInterviewCreate, db: Session = Depends(get_db)):
     """Create a new HR interview session"""
     try:
         result = hr_service.create_hr_interview_session(
@@ -1093,14 +1483,16 @@ async def create_hr_interview(interview_data: HRInterviewCreate, db: Session = D
         
         return result
         
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e)) from e
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to create HR interview: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to create HR interview: {str(e)}") from e
 
 @app.post("/generate-hr-question/")
 async def generate_hr_question(question_request: HRQuestionRequest, db: Session = Depends(get_db)):
     """Generate next HR question"""
     try:
-        result = hr_service.generate_next_hr_question(
+        result = await hr_service.generate_next_hr_question(
             db=db,
             session_id=question_request.session_id,
             resume_id=question_request.resume_id,
@@ -1109,11 +1501,23 @@ async def generate_hr_question(question_request: HRQuestionRequest, db: Session
         
         return result
         
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e)) from e
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to generate HR question: {str(e)}") from e
+
+@app.post("/generate-hr-hints/")
+async def generate_hr_hints(hints_request: HRHintsRequest):
+    """Answering tips for one HR question, fetched when the candidate opens the tips panel"""
+    try:
+        hints = await hr_service.question_generator.get_hints(hints_request.question)
+        return {"status": "success", "hints": hints}
+
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to generate HR question: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to generate hints: {str(e)}") from e
 
 @app.post("/submit-hr-answer/")
-async def submit_hr_answer(answer_data: HRAnswerSubmit, db: Session = Depends(get_db)):
+def submit_hr_answer(answer_data: HRAnswerSubmit, db: Session = Depends(get_db)):
     """Submit and evaluate HR answer"""
     try:
         result = hr_service.evaluate_hr_answer(
@@ -1127,27 +1531,57 @@ async def submit_hr_answer(answer_data: HRAnswerSubmit, db: Session = Depends(ge
         return result
         
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to evaluate HR answer: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to evaluate HR answer: {str(e)}") from e
+
+@app.post("/submit-hr-answer-and-next/")
+async def submit_hr_answer_and_next(answer_data: HRAnswerAndNextSubmit, db: Session = Depends(get_db)):
+    """Submit an HR answer and get the next question in a single request"""
+    try:
+        result = await hr_service.evaluate_hr_answer_and_next(
+            db=db,
+            session_id=answer_data.session_id,
+            resume_id=answer_data.resume_id,
+            question=answer_data.question,
+            answer=answer_data.answer,
+            previous_questions=answer_data.previous_questions
+        )
+        
+        return result
+        
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e)) from e
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to submit HR answer: {str(e)}") from e
 
 @app.post("/complete-hr-interview/{session_id}")
-async def complete_hr_interview(session_id: str, db: Session = Depends(get_db)):
+def complete_hr_interview(session_id: str, db: Session = Depends(get_db)):
     """Complete HR interview and generate report"""
     try:
         result = hr_service.generate_hr_interview_report(db=db, session_id=session_id)
         return result
         
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to complete HR interview: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to complete HR interview: {str(e)}") from e
 
 
 # ===== API STATUS CHECK ENDPOINT (FOR DEMO PREP) =====
+# A successful status check is reused for this long, so polling it doesn't spend Gemini quota
+API_STATUS_CACHE_SECONDS = 30
+_api_status_cache = TTLCache(maxsize=1, ttl=API_STATUS_CACHE_SECONDS)
+_api_status_cache_lock = threading.Lock()
+
 @app.get("/api-status-check")
-async def api_status_check():
+def api_status_check():
     """Check if Gemini API is working properly - USE THIS BEFORE YOUR DEMO!"""
+    with _api_status_cache_lock:
+        cached_status = _api_status_cache.get("status")
+    if cached_status is not None:
+        return cached_status
+
     try:
-        import google.generativeai as genai
-        
-        api_key = os.getenv("GEMINI_API_KEY", "")
+        api_key = GEMINI_API_KEY
         
         if not api_key:
             return {
@@ -1159,13 +1593,12 @@ async def api_status_check():
             }
         
         # Test API call
-        genai.configure(api_key=api_key)
-        model = genai.GenerativeModel('gemini-2.0-flash-exp')
+        model = get_gemini_model()
         
         test_response = model.generate_content("Say 'API Working' if you can read this.")
         
         if test_response and test_response.text:
-            return {
+            status = {
                 "status": "✅ SUCCESS",
                 "api_key_found": True,
                 "api_working": True,
@@ -1174,6 +1607,10 @@ async def api_status_check():
                 "message": "🎉 Your API is working! Demo ready!",
                 "demo_ready": True
             }
+            # Only successes are cached, so a fix to a failing setup shows up on the next check
+            with _api_status_cache_lock:
+                _api_status_cache["status"] = status
+            return status
         else:
             return {
                 "status": "⚠️ WARNING",
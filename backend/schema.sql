@@ -26,12 +26,20 @@ user_id TEXT NOT NULL REFERENCES users (user_id) ON DELETE CASCADE,
 upload_date TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
 job_role TEXT, -- The role the user is targeting
 
--- Raw text extracted from the PDF/DOCX (for LLM context)
-raw_text TEXT NOT NULL, 
+-- Raw text extracted from the PDF/DOCX (for LLM context).
+-- Large values are TOASTed out of line; lz4 compresses them faster than the default pglz (Postgres 14+)
+-- On an existing database: ALTER TABLE resumes ALTER COLUMN raw_text SET COMPRESSION lz4; (applies to rows written afterwards)
+raw_text TEXT COMPRESSION lz4 NOT NULL, 
 
 -- Structured analysis by the LLM (e.g., JSON of skills, experience, education)
 structured_data JSONB, 
 
+-- HR question set (categories of questions) generated from the resume at analysis time
+initial_questions JSONB,
+
+-- ATS match report against the target job description (match_score, missing_keywords, suggestions)
+ats_report JSONB,
+
 -- If using pgvector later, this column will hold the resume's vector embedding.
 embedding VECTOR(1536) -- Standard dimension for common embedding models
 
@@ -53,7 +61,10 @@ difficulty TEXT, -- e.g., 'easy', 'medium', 'hard'
 topics_covered TEXT[], -- Array of topics, e.g., ['SQL', 'React']
 
 final_score NUMERIC(5, 2), -- The final numerical score (e.g., 85.50)
-final_report TEXT -- The comprehensive guidance generated by the LLM
+status TEXT DEFAULT 'active', -- 'active' until the report is generated, then 'completed'
+-- The comprehensive guidance generated by the LLM.
+-- On an existing database: ALTER TABLE interview_sessions ALTER COLUMN final_report TYPE JSONB USING final_report::jsonb;
+final_report JSONB
 
 
 );
@@ -85,6 +96,44 @@ embedding VECTOR(1536)
 
 -- 5. INDEXES (For speed)
 -- Create indexes to speed up queries on foreign keys and timestamps.
-CREATE INDEX idx_messages_session_id ON interview_messages (session_id);
-CREATE INDEX idx_sessions_user_id ON interview_sessions (user_id);
-CREATE INDEX idx_resumes_user_id ON resumes (user_id);
\ No newline at end of file
+CREATE INDEX idx_messages_session_id_timestamp ON interview_messages (session_id, timestamp);
+-- Interview history lists a user's sessions newest first.
+-- On an existing database: CREATE INDEX CONCURRENTLY idx_sessions_user_id_start_time ...; DROP INDEX idx_sessions_user_id;
+CREATE INDEX idx_sessions_user_id_start_time ON interview_sessions (user_id, start_time DESC);
+-- History and stats only read completed sessions; the INCLUDE columns let both run as index-only scans.
+-- On an existing database: CREATE INDEX CONCURRENTLY idx_sessions_user_id_completed_start_time ...;
+CREATE INDEX idx_sessions_user_id_completed_start_time ON interview_sessions (user_id, start_time DESC)
+INCLUDE (session_id, end_time, difficulty, topics_covered, final_score)
+WHERE status = 'completed';
+-- Latest-resume lookups (WHERE user_id = ? ORDER BY upload_date DESC LIMIT 1) are a single probe.
+-- On an existing database: CREATE INDEX CONCURRENTLY idx_resumes_user_id_upload_date ...; DROP INDEX idx_resumes_user_id;
+CREATE INDEX idx_resumes_user_id_upload_date ON resumes (user_id, upload_date DESC);
+
+
+-- 6. FUNCTIONS
+-- Creates the user on first upload and stores the resume in a single call from the API.
+CREATE OR REPLACE FUNCTION upsert_user_and_insert_resume(
+p_user_id TEXT,
+p_email TEXT,
+p_job_role TEXT,
+p_raw_text TEXT,
+p_ats_report JSONB
+) RETURNS UUID AS $$
+INSERT INTO users (user_id, email) VALUES (p_user_id, p_email)
+ON CONFLICT (user_id) DO NOTHING;
+
+INSERT INTO resumes (user_id, job_role, raw_text, ats_report)
+VALUES (p_user_id, p_job_role, p_raw_text, p_ats_report)
+RETURNING resume_id;
+$$ LANGUAGE sql;
+
+-- Dashboard statistics for a user's completed interviews, aggregated here so one row comes back.
+CREATE OR REPLACE FUNCTION get_user_stats(
+p_user_id TEXT
+) RETURNS TABLE (interviews_completed BIGINT, average_score INTEGER, total_seconds DOUBLE PRECISION) AS $$
+SELECT count(*),
+round(avg(final_score))::INTEGER,
+coalesce(sum(extract(epoch FROM end_time - start_time)), 0)::DOUBLE PRECISION
+FROM interview_sessions
+WHERE user_id = p_user_id AND status = 'completed';
+$$ LANGUAGE sql STABLE;
@@ -251,6 +251,10 @@ const ResumeActionHub = ({ onNavigate, notify }) => {
 };
 
 // --- ATS Report Display Component ---
+// The report is generated after upload; poll for up to a minute
+const ATS_REPORT_POLL_INTERVAL_MS = 2000;
+const ATS_REPORT_MAX_POLLS = 30;
+
 const ATSReportView = ({ user, onNavigate, notify }) => {
   const [reportData, setReportData] = useState(null);
   const [loading, setLoading] = useState(true);
@@ -267,9 +271,23 @@ const ATSReportView = ({ user, onNavigate, notify }) => {
         setLoading(true);
         setError(null);
 
-        const response = await fetch(
-          `http://localhost:8000/ats-report/${user.id}`
-        );
+        // 202 means the report is still being generated after the upload; poll until it lands
+        let response;
+        for (let attempt = 0; attempt < ATS_REPORT_MAX_POLLS; attempt++) {
+          response = await fetch(
+            `http://localhost:8000/ats-report/${user.id}`
+          );
+          if (response.status !== 202) break;
+          await new Promise((resolve) =>
+            setTimeout(resolve, ATS_REPORT_POLL_INTERVAL_MS)
+          );
+        }
+
+        if (response.status === 202) {
+          throw new Error(
+            "The ATS report is taking longer than expected. Please try again shortly."
+          );
+        }
 
         if (!response.ok) {
           const errorData = await response.json();
@@ -503,7 +521,12 @@ const ResumeUpload = ({ user, onNavigate, notify }) => {
       const data = await response.json();
       console.log("Upload successful:", data);
       setUploadSuccess(true);
-      notify("Resume uploaded and analyzed successfully!", "success");
+      notify(
+        data.status === "pending"
+          ? "Resume uploaded! Your ATS report is being generated."
+          : "Resume uploaded and analyzed successfully!",
+        "success"
+      );
       setTimeout(() => onNavigate("action-hub"), 2000);
     } catch (error) {
       console.error("Upload failed:", error);
@@ -1345,6 +1368,37 @@ const HRInterviewSession = ({ user, onNavigate, config, notify }) => {
   const [currentQuestionNumber, setCurrentQuestionNumber] = useState(1);
   const [totalQuestions] = useState(8);
   const [evaluation, setEvaluation] = useState(null);
+  const [hintsLoading, setHintsLoading] = useState(false);
+
+  // Hints aren't part of the generated question; fetch them the first time the tips panel opens
+  const loadHRHints = async (event) => {
+    if (!event.target.open || !currentQuestion || currentQuestion.hints || hintsLoading) {
+      return;
+    }
+    const question = currentQuestion.question;
+    try {
+      setHintsLoading(true);
+      const response = await fetch("http://localhost:8000/generate-hr-hints/", {
+        method: "POST",
+        headers: {
+          "Content-Type": "application/json",
+        },
+        body: JSON.stringify({ question }),
+      });
+      if (!response.ok) {
+        throw new Error("Failed to load hints");
+      }
+      const data = await response.json();
+      setCurrentQuestion((prev) =>
+        prev && prev.question === question ? { ...prev, hints: data.hints } : prev
+      );
+    } catch (error) {
+      console.error("Failed to load HR hints:", error);
+      notify("Couldn't load tips for this question", "error");
+    } finally {
+      setHintsLoading(false);
+    }
+  };
 
   // Generate next HR question
   const generateNextHRQuestion = useCallback(async () => {
@@ -1433,19 +1487,28 @@ const HRInterviewSession = ({ user, onNavigate, config, notify }) => {
     try {
       setLoading(true);
 
-      // Submit answer to backend
-      const response = await fetch("http://localhost:8000/submit-hr-answer/", {
-        method: "POST",
-        headers: {
-          "Content-Type": "application/json",
-        },
-        body: JSON.stringify({
-          session_id: sessionId,
-          question: currentQuestion.question,
-          answer: answer,
-          message_id: currentQuestion.message_id,
-        }),
-      });
+      // Submit answer to backend; mid-interview the answer is saved and the
+      // next question generated in the same request
+      const isLastQuestion = currentQuestionNumber >= totalQuestions;
+      const response = await fetch(
+        isLastQuestion
+          ? "http://localhost:8000/submit-hr-answer/"
+          : "http://localhost:8000/submit-hr-answer-and-next/",
+        {
+          method: "POST",
+          headers: {
+            "Content-Type": "application/json",
+          },
+          body: JSON.stringify({
+            session_id: sessionId,
+            resume_id: config?.resumeId,
+            question: currentQuestion.question,
+            answer: answer,
+            message_id: currentQuestion.message_id,
+            previous_questions: questionsHistory.map((q) => q.question),
+          }),
+        }
+      );
 
       if (!response.ok) {
         const errorData = await response.json();
@@ -1464,11 +1527,17 @@ const HRInterviewSession = ({ user, onNavigate, config, notify }) => {
       }
 
       // Move to next question or finish
-      if (currentQuestionNumber < totalQuestions) {
+      if (!isLastQuestion) {
+        const nextQuestion = {
+          ...result.question,
+          message_id: result.message_id,
+          number: currentQuestionNumber + 1,
+        };
         setCurrentQuestionNumber((prev) => prev + 1);
         setAnswer("");
         setEvaluation(null);
-        setTimeout(() => generateNextHRQuestion(), 1000);
+        setCurrentQuestion(nextQuestion);
+        setQuestionsHistory((prev) => [...prev, nextQuestion]);
       } else {
         notify("HR Interview completed! Generating report...", "info");
 
@@ -1627,13 +1696,18 @@ const HRInterviewSession = ({ user, onNavigate, config, notify }) => {
             )}
 
             {/* Question-Specific Hints */}
-            {currentQuestion?.hints && currentQuestion.hints.length > 0 && (
+            {currentQuestion?.question && (
               <div className="hr-answer-hints">
-                <details>
+                <details key={currentQuestion.question} onToggle={loadHRHints}>
                   <summary>
                     💡 Tips for answering this question (click to expand)
                   </summary>
                   <div className="hints-content">
+                    {hintsLoading && !currentQuestion.hints && (
+                      <p style={{ color: "#a0aec0", margin: "10px 0" }}>
+                        Loading tips...
+                      </p>
+                    )}
                     <ul
                       style={{
                         margin: "10px 0",
@@ -1641,7 +1715,7 @@ const HRInterviewSession = ({ user, onNavigate, config, notify }) => {
                         listStyle: "none",
                       }}
                     >
-                      {currentQuestion.hints.map((hint, index) => (
+                      {(currentQuestion.hints || []).map((hint, index) => (
                         <li
                           key={index}
                           style={{